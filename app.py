@@ -40,6 +40,8 @@ DEFAULT_SETTINGS_CONTENT = {
     "font_size": 24,
     "show_timestamp": True,
     "record_video": False,
+    "record_dir": os.path.join(BASE_DIR, "recordings"),
+    "cache_dir": os.path.join(BASE_DIR, "cache"),
     "timestamp_mode": "word",
     "timestamps_file_word": os.path.join(MEDIA_DIR, "shorts-transcript_by_word.txt"),
     "timestamps_file_sentence": os.path.join(MEDIA_DIR, "shorts-transcript_by_sentence.txt"),
@@ -305,10 +307,6 @@ def main(start_time, exit_flag):                  # <-- add exit_flag
     import os
     import time
 
-    # --- HARD-CODED DELAY IN SECONDS ---
-    DELAY_SECONDS = 0.695
-    time.sleep(DELAY_SECONDS)
-
     # --- Set window size to match child video dimensions ---
     video_path = os.path.join(BASE_DIR, "output.mp4")
     import av
@@ -329,7 +327,7 @@ def main(start_time, exit_flag):                  # <-- add exit_flag
     # --- load settings ---
     settings = load_json(DEFAULT_SETTINGS_PATH, DEFAULT_SETTINGS_CONTENT)
     for key in ["font_name", "timestamps_file_word", "timestamps_file_sentence",
-                "event_schedule_path", "voiceover_path"]:
+                "event_schedule_path", "voiceover_path", "record_dir", "cache_dir"]:
         settings[key] = resolve_path(BASE_DIR, settings.get(key), DEFAULT_SETTINGS_CONTENT.get(key, ""))
 
     if not os.path.exists(settings["event_schedule_path"]):
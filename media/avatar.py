@@ -3,8 +3,11 @@ import random
 import sys
 import math
 import time
+from utils import load_root_module
 from utils.lipsync import LipsyncPlayer
 
+particles = load_root_module("particles")
+
 # Init lipsync
 #lipsync = LipsyncPlayer("vocals.wav", "mouth_*.png", fps=30, img_size=(120, 120))
 #lipsync.start()
@@ -88,6 +91,70 @@ def pendulum_offset(t, amplitude, speed, sharpen):
         angle = math.copysign(abs(angle)**sharpen, angle)
     return angle * amplitude
 
+# --- Scene ---
+class AvatarScene:
+    """
+    Blurred background and scaled sprites for one window size.
+
+    Everything derived from the source images depends only on the window size,
+    so it is built in resize() and each frame is just blits. Scaled lipsync mouths
+    are cached per mouth image until the next resize.
+
+    Example usage:
+        scene = AvatarScene(background_orig, sprites, sprite_scales, sprite_positions)
+        scene.resize(screen.get_size())              # at start and on VIDEORESIZE
+        scene.draw_background(screen)
+        scene.draw_sprites(screen, x_offset, lipsync.update())
+    """
+    def __init__(self, background, sprites, scales, positions, blur_passes=6, table_brightness=0.6):
+        self.background_orig = background
+        self.sprites_orig = sprites      # name -> full-size surface
+        self.scales = scales
+        self.positions = positions
+        self.blur_passes = blur_passes
+        self.table_brightness = table_brightness
+        self.size = None
+
+    def resize(self, size):
+        """Rebuild every derived surface for a window of size (w, h)."""
+        if size == self.size:
+            return
+        self.size = size
+        background = pygame.transform.smoothscale(self.background_orig, size)
+        self.background = gaussian_blur(background, passes=self.blur_passes, scale_factor=4)
+
+        self.sprites = {}
+        for name, sprite in self.sprites_orig.items():
+            scaled = scale_sprite(sprite, self.scales[name], size)
+            if name == "table":
+                scaled = adjust_brightness(scaled, self.table_brightness)   # darker, keeps transparent edges
+            self.sprites[name] = (scaled, get_sprite_position(self.positions[name], size, scaled.get_size()))
+        self.mouths = {}
+        self.mouth = None
+
+    def _scaled_mouth(self, mouth_surface):
+        mouth = self.mouths.get(mouth_surface)
+        if mouth is None:
+            mouth = scale_sprite(mouth_surface, self.scales["mouth"], self.size)
+            self.mouths[mouth_surface] = mouth
+        return mouth
+
+    def draw_background(self, surface):
+        surface.blit(self.background, (0, 0))
+
+    def draw_sprites(self, surface, x_offset, mouth_surface=None):
+        """Avatar and mouth sway by x_offset; the last mouth stays up while lipsync has none."""
+        if mouth_surface:
+            self.mouth = self._scaled_mouth(mouth_surface)
+        avatar, (x, y) = self.sprites["avatar"]
+        surface.blit(avatar, (x + x_offset, y))
+        if self.mouth is not None:
+            x, y = get_sprite_position(self.positions["mouth"], self.size, self.mouth.get_size())
+            surface.blit(self.mouth, (x + x_offset, y))
+        for name in ("table", "computer", "mic"):
+            sprite, pos = self.sprites[name]
+            surface.blit(sprite, pos)
+
 # --- Initialize Pygame ---
 pygame.init()
 WIN_WIDTH, WIN_HEIGHT = 1280, 720
@@ -123,37 +190,20 @@ sprite_positions = {
     "mic": (0.3, 0.6)
 }
 
+scene = AvatarScene(background_orig,
+                    {"avatar": avatar_orig, "table": table_orig, "computer": computer_orig, "mic": mic_orig},
+                    sprite_scales, sprite_positions)
+scene.resize(screen.get_size())
+
 # --- Pendulum parameters ---
 pendulum_amplitude = 10.0
 pendulum_speed = 2.0
 pendulum_sharpen = 1.0
 pendulum_start_time = time.time()
 
-# --- Ember effect ---
-class Ember:
-    def __init__(self):
-        self.reset()
-    def reset(self):
-        self.y = random.uniform(0, WIN_HEIGHT)
-        self.speed_y = random.uniform(-3, -0.5)
-        self.x = random.uniform(0, WIN_WIDTH)
-        self.radius = random.uniform(2,6)
-        self.color = (random.randint(200,255), random.randint(50,120),0)
-        self.speed_x = random.uniform(-1,1)
-        self.alpha = random.randint(150,255)
-    def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.alpha -= random.uniform(1,3)
-        self.radius = max(0,self.radius-0.02)
-        if self.alpha <=0 or self.y<0 or self.radius<=0:
-            self.reset()
-    def draw(self,surface):
-        ember_surf = pygame.Surface((self.radius*2,self.radius*2), pygame.SRCALPHA)
-        pygame.draw.circle(ember_surf, (*self.color,int(self.alpha)), (int(self.radius),int(self.radius)), int(self.radius))
-        surface.blit(ember_surf,(self.x - self.radius, self.y - self.radius))
-
-embers = [Ember() for _ in range(250)]
+# --- Ember effect (embers spawn anywhere on screen, rising at -3..-0.5 px/frame) ---
+embers = particles.ParticleSystem((WIN_WIDTH, WIN_HEIGHT), count=250, high_start_chance=1.0,
+                                  high_margin=0, high_speed=(-3.0, -0.5))
 
 # --- Faint sweeping bars overlay ---
 NUM_BARS = 50
@@ -170,6 +220,8 @@ class OscillatingBar:
         self.direction = random.choice([-1,1])
         self.color = (255,255,255,15)  # very faint
         self.width = random.randint(50,200)
+        self.surface = pygame.Surface((self.width,BAR_HEIGHT), pygame.SRCALPHA)
+        self.surface.fill(self.color)
         self.base_x = WIN_WIDTH//2
         self.y = 0
         self.visible = False
@@ -178,9 +230,7 @@ class OscillatingBar:
         self.visible = sweep_y >= self.y and sweep_y <= self.y + BAR_HEIGHT
     def draw(self,surface):
         if self.visible:
-            bar_surf = pygame.Surface((self.width,BAR_HEIGHT), pygame.SRCALPHA)
-            bar_surf.fill(self.color)
-            surface.blit(bar_surf, (int(self.x - self.width//2), int(self.y)))
+            surface.blit(self.surface, (int(self.x - self.width//2), int(self.y)))
 
 bars = []
 start_y = WIN_HEIGHT//2 - ((NUM_BARS*(BAR_HEIGHT+BAR_SPACING))//2)
@@ -206,77 +256,23 @@ while running:
         elif event.type == pygame.VIDEORESIZE:
             WIN_WIDTH, WIN_HEIGHT = event.w, event.h
             screen = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT), pygame.RESIZABLE)
+            embers.resize((WIN_WIDTH, WIN_HEIGHT))
+            scene.resize(screen.get_size())
             start_y = WIN_HEIGHT//2 - ((NUM_BARS*(BAR_HEIGHT+BAR_SPACING))//2)
             for i,bar in enumerate(bars):
                 bar.base_x = WIN_WIDTH//2
                 bar.y = start_y + i*(BAR_HEIGHT+BAR_SPACING)
 
-    # --- Draw background & blur ---
-    bg_width, bg_height = screen.get_size()
-    background = pygame.transform.smoothscale(background_orig, (bg_width, bg_height))
-    background = gaussian_blur(background, passes=6, scale_factor=4)
-    screen.blit(background, (0, 0))
+    # --- Draw background (blurred once per window size) ---
+    scene.draw_background(screen)
 
     # --- Draw embers ---
-    for ember in embers:
-        ember.update()
-        ember.draw(screen)
-
-    # --- Draw avatar & sprites ---
-    avatar = scale_sprite(avatar_orig, sprite_scales["avatar"], (bg_width,bg_height))
-    #mouth = scale_sprite(mouth_orig, sprite_scales["mouth"], (bg_width,bg_height))
-    # --- Lipsync mouth ---
-    #x_offset = pendulum_offset(t, pendulum_amplitude, pendulum_speed, pendulum_sharpen)
-    #mouth_surface = lipsync.update()
-    #if mouth_surface:
-    # Scale mouth relative to background
-        #mouth_surface.set_colorkey((0, 0, 0))
-    #    mouth_surface = lipsync.update()
-    #    if mouth_surface:
-    #        mouth = scale_sprite(mouth_surface, sprite_scales["mouth"], (bg_width, bg_height))
-    #        mouth_pos = (
-    #            get_sprite_position(sprite_positions["mouth"], (bg_width,bg_height), mouth.get_size())[0] + x_offset,
-    #            get_sprite_position(sprite_positions["mouth"], (bg_width,bg_height), mouth.get_size())[1]
-    #        )
-    #        screen.blit(mouth, mouth_pos)
+    embers.step()
+    embers.draw(screen)
 
+    # --- Draw avatar, lipsync mouth & sprites ---
     x_offset = pendulum_offset(t, pendulum_amplitude, pendulum_speed, pendulum_sharpen)
-    mouth_surface = lipsync.update()
-    if mouth_surface:
-        mouth = scale_sprite(mouth_surface, sprite_scales["mouth"], (bg_width, bg_height))
-        mouth_pos = (
-            get_sprite_position(sprite_positions["mouth"], (bg_width,bg_height), mouth.get_size())[0] + x_offset,
-            get_sprite_position(sprite_positions["mouth"], (bg_width,bg_height), mouth.get_size())[1]
-        )
-        screen.blit(mouth, mouth_pos)
-
-        mouth = scale_sprite(mouth_surface, sprite_scales["mouth"], (bg_width, bg_height))
-    # Compute position with avatar sway
-        mouth_pos = (
-            get_sprite_position(sprite_positions["mouth"], (bg_width,bg_height), mouth.get_size())[0] + x_offset,
-            get_sprite_position(sprite_positions["mouth"], (bg_width,bg_height), mouth.get_size())[1]
-        )
-        screen.blit(mouth, mouth_pos)
-
-    table = scale_sprite(table_orig, sprite_scales["table"], (bg_width,bg_height))
-    #table = adjust_brightness(table, 0.6)   # make desk darker (60% brightness)
-    table = scale_sprite(table_orig, sprite_scales["table"], (bg_width, bg_height))
-    table = adjust_brightness(table, 0.6)   # 60% brightness but keeps transparent edges
-
-    computer = scale_sprite(computer_orig, sprite_scales["computer"], (bg_width,bg_height))
-    mic = scale_sprite(mic_orig, sprite_scales["mic"], (bg_width,bg_height))
-
-
-    avatar_pos = (get_sprite_position(sprite_positions["avatar"], (bg_width,bg_height), avatar.get_size())[0]+x_offset,
-                  get_sprite_position(sprite_positions["avatar"], (bg_width,bg_height), avatar.get_size())[1])
-    mouth_pos = (get_sprite_position(sprite_positions["mouth"], (bg_width,bg_height), mouth.get_size())[0]+x_offset,
-                 get_sprite_position(sprite_positions["mouth"], (bg_width,bg_height), mouth.get_size())[1])
-
-    screen.blit(avatar, avatar_pos)
-    screen.blit(mouth, mouth_pos)
-    screen.blit(table, get_sprite_position(sprite_positions["table"], (bg_width,bg_height), table.get_size()))
-    screen.blit(computer, get_sprite_position(sprite_positions["computer"], (bg_width,bg_height), computer.get_size()))
-    screen.blit(mic, get_sprite_position(sprite_positions["mic"], (bg_width,bg_height), mic.get_size()))
+    scene.draw_sprites(screen, x_offset, lipsync.update())
 
     # --- Draw faint sweeping bars overlay ---
     for bar in bars:
@@ -1,7 +1,8 @@
 import pygame
-import random
 import sys
-import numpy  # <- Add this
+from utils import load_root_module
+
+glitch = load_root_module("glitch")
 
 # Initialize Pygame
 pygame.init()
@@ -14,30 +15,10 @@ clock = pygame.time.Clock()
 image = pygame.image.load("background.jpg").convert()
 image = pygame.transform.smoothscale(image, (WIDTH, HEIGHT))
 
-def glitch_surface(surface, intensity=0.1):
-    """Apply a glitch effect to a surface.
-    intensity: 0-1, fraction of lines to distort.
-    """
-    w, h = surface.get_size()
-    glitch_surf = surface.copy()
-
-    # Random horizontal shifts
-    for y in range(h):
-        if random.random() < intensity:
-            shift = random.randint(-20, 20)
-            line = surface.subsurface((0, y, w, 1))
-            glitch_surf.blit(line, (shift, y))
-    
-    # Optional RGB channel shift
-    r, g, b = pygame.surfarray.array3d(glitch_surf).swapaxes(0, 1).T[:3]
-    if random.random() < 0.3:
-        r = numpy.roll(r, random.randint(-5, 5), axis=1)
-        g = numpy.roll(g, random.randint(-5, 5), axis=1)
-        b = numpy.roll(b, random.randint(-5, 5), axis=1)
-        arr = numpy.stack([r, g, b], axis=2)
-        pygame.surfarray.blit_array(glitch_surf, arr)
-    
-    return glitch_surf
+# Glitch engine (seeded: the same frame number always glitches the same way)
+engine = glitch.GlitchEngine(seed=0)
+frame = pygame.Surface((WIDTH, HEIGHT)).convert()
+frame_number = 0
 
 running = True
 while running:
@@ -45,8 +26,10 @@ while running:
         if event.type == pygame.QUIT:
             running = False
 
-    glitched = glitch_surface(image, intensity=0.1)
-    screen.blit(glitched, (0, 0))
+    frame.blit(image, (0, 0))
+    engine.apply(frame, intensity=0.1, frame=frame_number)
+    frame_number += 1
+    screen.blit(frame, (0, 0))
 
     pygame.display.flip()
     clock.tick(30)
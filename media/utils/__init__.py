@@ -0,0 +1,16 @@
+import os
+import importlib.util
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_root_module(name):
+    """
+    The project's utils/<name>.py. Loaded by path: scripts in media/ run with
+    media/ on sys.path, where "utils" is this package rather than the project's.
+    """
+    path = os.path.join(ROOT_DIR, "utils", f"{name}.py")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
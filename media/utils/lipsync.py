@@ -1,12 +1,46 @@
+import os
+import glob
+import hashlib
 import pygame
-import librosa
 import numpy as np
-import glob
-import time
+from . import ROOT_DIR, load_root_module
+
+ENERGY_CACHE_VERSION = 1
+
+
+def _file_sha1(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def key_black(img):
+    """Copy of an RGBA surface with pure black pixels made fully transparent."""
+    img = img.copy()
+    r_mask, g_mask, b_mask, a_mask = img.get_masks()
+    pixels = pygame.surfarray.pixels2d(img)      # one packed uint32 per pixel
+    black = (pixels & (r_mask | g_mask | b_mask)) == 0
+    pixels[black] &= ~a_mask & 0xFFFFFFFF
+    del pixels   # release the pixel lock
+    return img
+
+
+def framed_energy(y, frame_length, hop_length):
+    """
+    Sum of squares of y over frame_length samples starting every hop_length samples
+    (the last frames are truncated at the end of y). Prefix sums: one pass, any length.
+    """
+    power = np.concatenate(([0.0], np.cumsum(np.square(y, dtype=np.float64))))
+    starts = np.arange(0, len(y), hop_length)
+    ends = np.minimum(starts + frame_length, len(y))
+    return np.maximum(power[ends] - power[starts], 0.0)
+
 
 class LipsyncPlayer:
     def __init__(self, audio_file="vocals.wav", image_pattern="mouth_*.png",
-                 fps=30, img_size=(200, 200), min_frame=1, smooth_window=3):
+                 fps=30, img_size=(200, 200), min_frame=1, smooth_window=3, clock=None, cache_dir=None):
         """
         audio_file: path to wav file
         image_pattern: glob pattern for mouth images
@@ -14,6 +48,9 @@ class LipsyncPlayer:
         img_size: size to scale mouth images
         min_frame: minimum frame index for nonzero energy (avoid always closed mouth)
         smooth_window: size of smoothing window for energy (set 1 to disable)
+        clock: shared MediaClock of a player that already plays audio_file; when None,
+               start() plays it and follows it with its own MediaClock
+        cache_dir: where mouth index tracks are cached (default: the project's cache/)
         """
         self.audio_file = audio_file
         self.image_pattern = image_pattern
@@ -21,6 +58,7 @@ class LipsyncPlayer:
         self.img_size = img_size
         self.min_frame = min_frame
         self.smooth_window = smooth_window
+        self.cache_dir = cache_dir or os.path.join(ROOT_DIR, "cache")
 
         # --- Load mouth images ---
         self.mouth_shapes = sorted(glob.glob(image_pattern))
@@ -32,54 +70,73 @@ class LipsyncPlayer:
 
         for f in self.mouth_shapes:
             img = pygame.image.load(f).convert_alpha()  # preserve alpha
-            # Convert black background to transparent
-            w, h = img.get_size()
-            transparent_img = pygame.Surface((w, h), pygame.SRCALPHA)
-            for x in range(w):
-                for y in range(h):
-                    color = img.get_at((x, y))
-                    if color[:3] == (0, 0, 0):
-                        transparent_img.set_at((x, y), (0, 0, 0, 0))
-                    else:
-                        transparent_img.set_at((x, y), color)
-            # Scale to desired size
-            transparent_img = pygame.transform.smoothscale(transparent_img, self.img_size)
-            self.mouth_imgs.append(transparent_img)
+            # Convert black background to transparent, then scale to desired size
+            self.mouth_imgs.append(pygame.transform.smoothscale(key_black(img), self.img_size))
+
+        # --- Mouth index per frame, from the cache when the audio is unchanged ---
+        self.energy = self._load_energy()
+
+        self.running = False
+        self.clock = clock
+        self.owns_clock = clock is None
+
+    def _energy_cache_path(self):
+        key = (f"{_file_sha1(self.audio_file)}:fps={self.fps}:shapes={self.num_shapes}:"
+               f"min={self.min_frame}:smooth={self.smooth_window}:v{ENERGY_CACHE_VERSION}")
+        name = hashlib.sha1(key.encode()).hexdigest()[:20]
+        return os.path.join(self.cache_dir, "lipsync", f"{name}.npy")
+
+    def _load_energy(self):
+        path = self._energy_cache_path()
+        try:
+            return np.load(path)
+        except (OSError, ValueError):
+            pass
+
+        energy = self._compute_energy()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".part.npy"
+            np.save(tmp, energy)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[WARN] Could not write lipsync cache {path}: {e}")
+        return energy
+
+    def _compute_energy(self):
+        """Mouth index (0..num_shapes-1) for every 1/fps frame of the audio."""
+        import librosa   # slow to import; not needed when the track is cached
 
         # --- Extract energy from audio ---
-        y, sr = librosa.load(audio_file, sr=None)
+        y, sr = librosa.load(self.audio_file, sr=None)
         frame_length = int(0.025 * sr)  # 25 ms
-        hop_length = int(sr / fps)
-
-        energy = np.array([
-            np.sum(np.abs(y[i:i + frame_length]) ** 2)
-            for i in range(0, len(y), hop_length)
-        ])
+        hop_length = int(sr / self.fps)
+        energy = framed_energy(y, frame_length, hop_length)
 
         # Normalize and threshold
         if energy.max() > energy.min():
-            self.energy = np.interp(
+            energy = np.interp(
                 energy,
                 (energy.min(), energy.max()),
                 (self.min_frame, self.num_shapes - 1)
             ).astype(int)
         else:
-            self.energy = np.zeros_like(energy, dtype=int)
+            energy = np.zeros_like(energy, dtype=int)
 
         # Smooth energy for natural movement
-        if smooth_window > 1:
-            kernel = np.ones(smooth_window) / smooth_window
-            self.energy = np.convolve(self.energy, kernel, mode='same').astype(int)
-
-        self.running = False
-        self.start_time = None
+        if self.smooth_window > 1:
+            kernel = np.ones(self.smooth_window) / self.smooth_window
+            energy = np.convolve(energy, kernel, mode='same').astype(int)
+        return energy
 
     def start(self):
-        """Start audio playback and reset timer."""
-        pygame.mixer.init()
-        pygame.mixer.music.load(self.audio_file)
-        pygame.mixer.music.play()
-        self.start_time = time.time()
+        """Start audio playback and follow its playback position."""
+        if self.owns_clock:
+            media_clock = load_root_module("media_clock")
+            pygame.mixer.init()
+            pygame.mixer.music.load(self.audio_file)
+            pygame.mixer.music.play()
+            self.clock = media_clock.MediaClock(media_clock.music_position)
         self.running = True
 
     def update(self):
@@ -91,8 +148,8 @@ class LipsyncPlayer:
             self.running = False
             return None
 
-        # Determine current frame based on elapsed time
-        elapsed = time.time() - self.start_time
+        # Determine current frame from the audio playback position
+        elapsed = self.clock.time()
         frame_idx = int(elapsed * self.fps)
         if frame_idx >= len(self.energy):
             self.running = False
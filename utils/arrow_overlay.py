@@ -1,5 +1,6 @@
 # utils/arrow_overlay.py
 import pygame
+from utils.asset_cache import load_surface
 
 class ArrowOverlay:
     """
@@ -25,13 +26,9 @@ class ArrowOverlay:
         self.scale = params.get("scale", 1.0)
         self.image_path = params.get("arrow_image_path")
 
-        # Load the arrow image
-        self.original_image = pygame.image.load(self.image_path).convert_alpha()
-
-        # Scale image according to the scale parameter
-        orig_rect = self.original_image.get_rect()
-        scaled_size = (int(orig_rect.width * self.scale), int(orig_rect.height * self.scale))
-        self.image = pygame.transform.smoothscale(self.original_image, scaled_size)
+        # Load the arrow image (full size and scaled) through the shared asset cache
+        self.original_image = load_surface(self.image_path)
+        self.image = load_surface(self.image_path, scale=self.scale)
 
         # Rotate image (pre-rotation)
         self.rotated_image = pygame.transform.rotate(self.image, self.rotation)
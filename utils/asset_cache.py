@@ -0,0 +1,121 @@
+# utils/asset_cache.py
+"""
+Shared decoded-image cache for every effect that loads pictures from disk.
+
+Surfaces are keyed by (path, mtime, scale, pixel format) and evicted least
+recently used once the total pixel memory exceeds a byte budget. Returned
+surfaces are shared between callers: copy them before drawing onto them.
+"""
+import os
+from collections import OrderedDict
+import pygame
+
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024  # 256 MB of pixel data
+
+
+def surface_nbytes(surface):
+    """Approximate memory held by a surface's pixels."""
+    return surface.get_pitch() * surface.get_height()
+
+
+def scaled_size(size, scale):
+    """Target size for scale: a float factor or an explicit (w, h)."""
+    if isinstance(scale, (tuple, list)):
+        return (int(scale[0]), int(scale[1]))
+    return (int(size[0] * scale), int(size[1] * scale))
+
+
+class SurfaceCache:
+    """
+    Byte-budget LRU cache of loaded (and optionally scaled) pygame surfaces.
+
+    Example usage:
+        image = asset_cache.load("media/phone1.png", scale=0.3)
+        print(asset_cache.stats())
+    """
+    def __init__(self, max_bytes=DEFAULT_BUDGET_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, path, scale, alpha):
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        if isinstance(scale, list):
+            scale = tuple(scale)
+        if scale == 1.0:
+            scale = None
+        return (path, mtime, scale, "alpha" if alpha else "opaque")
+
+    def _get(self, key):
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return surface
+
+    def _put(self, key, surface):
+        self.misses += 1
+        self.entries[key] = surface
+        self.total_bytes += surface_nbytes(surface)
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.total_bytes -= surface_nbytes(old)
+            self.evictions += 1
+        return surface
+
+    def load(self, path, scale=None, alpha=True):
+        """
+        Return the image at path, converted for the display and scaled by scale
+        (float factor or (w, h)). Raises FileNotFoundError / pygame.error like
+        pygame.image.load does.
+        """
+        key = self._key(path, scale, alpha)
+        surface = self._get(key)
+        if surface is not None:
+            return surface
+
+        if key[2] is None:
+            image = pygame.image.load(path)
+            surface = image.convert_alpha() if alpha else image.convert()
+        else:
+            # Derive scaled variants from the cached full-size decode
+            base = self.load(path, None, alpha)
+            surface = pygame.transform.smoothscale(base, scaled_size(base.get_size(), key[2]))
+        return self._put(key, surface)
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Counters for profiling: hits, misses, evictions, entries and bytes held."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# Process-wide cache shared by all effects
+asset_cache = SurfaceCache()
+
+
+def load_surface(path, scale=None, alpha=True):
+    """Load an image through the shared asset cache."""
+    return asset_cache.load(path, scale=scale, alpha=alpha)
+
+
+def cache_stats():
+    return asset_cache.stats()
@@ -78,6 +78,73 @@ def play_circular_pulsing_net(screen, t=0, net_surface=None, mask_surface=None):
     screen.blit(masked_surface, (0, 0))
 
 
+class CircularPulsingNet:
+    """
+    Stateful circular pulsing net background.
+
+    Keeps one radial mask per target size and draws straight onto the target:
+    the net lines go onto the black-filled screen and the radial falloff is a
+    single RGB multiply, so no surface is allocated per frame.
+
+    Example usage:
+        net = CircularPulsingNet()
+        net.draw(screen, t=current_time)   # once per frame
+    """
+    def __init__(self, grid_spacing=GRID_SPACING, color=BLUE, amplitude=100):
+        self.grid_spacing = grid_spacing
+        self.color = color
+        self.amplitude = amplitude
+        self.masks = {}
+
+    def _mask(self, size):
+        """Radial falloff as a grey RGB surface (value = alpha of create_radial_mask)."""
+        mask = self.masks.get(size)
+        if mask is None:
+            radius = min(size) // 2 - 20
+            center_x, center_y = size[0] // 2, size[1] // 2
+            x, y = np.ogrid[:size[0], :size[1]]
+            dist = np.sqrt((x - center_x) ** 2 + (y - center_y) ** 2)
+            alpha = np.clip(255 - (dist / radius) * 255, 0, 255).astype(np.uint8)
+            mask = pygame.surfarray.make_surface(np.repeat(alpha[:, :, None], 3, axis=2))
+            self.masks[size] = mask
+        return mask
+
+    def vertices(self, size, t, pulse):
+        """
+        Net vertices as an (nx, ny, 2) array: vertical line i is vertices[i],
+        horizontal line j is vertices[:, j]. Columns that cannot reach the
+        screen even at full swing are left out.
+        """
+        width, height = size
+        gs = self.grid_spacing
+        ys = np.arange(0, height + gs, gs, dtype=np.float64)
+        xs = np.arange(-width, width * 2, gs, dtype=np.float64)
+
+        swing = self.amplitude * pulse
+        xs = xs[(xs + swing >= -gs) & (xs - swing <= width + gs)]
+
+        offsets = np.sin(ys * 0.01 + t) * swing
+        verts = np.empty((len(xs), len(ys), 2))
+        verts[..., 0] = xs[:, None] + offsets[None, :]
+        verts[..., 1] = ys[None, :]
+        return verts
+
+    def draw(self, screen, t=0):
+        """Draw one frame of the net at time t (seconds)."""
+        size = screen.get_size()
+        pulse = 1 + 0.2 * math.sin(t * 2)
+        verts = self.vertices(size, t, pulse)
+
+        screen.fill(BLACK)
+        if verts.shape[0] and verts.shape[1] > 1:
+            for line in verts.tolist():
+                pygame.draw.lines(screen, self.color, False, line, 1)
+            # Each horizontal line is straight, so one segment per row is enough
+            for j in range(verts.shape[1]):
+                pygame.draw.line(screen, self.color, verts[0, j], verts[-1, j], 1)
+        screen.blit(self._mask(size), (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+
+
 # -------------------------
 # Circular Pulsing Net
 # -------------------------
@@ -0,0 +1,336 @@
+# utils/benchmark.py
+"""
+Headless benchmark of the visual effects used by run_visuals.
+
+Every effect draws a fixed number of frames under the SDL dummy driver at each
+resolution, in its own fresh process (so caches and peak memory don't leak from
+one case into the next). Results are frames/sec, per-frame latency percentiles
+and peak RSS, written as JSON and optionally compared against a stored baseline.
+
+Usage (from the project root):
+    python -m utils.benchmark --frames 120 --output bench.json
+    python -m utils.benchmark --save-baseline                  # record utils/json/benchmark_baseline.json
+    python -m utils.benchmark --compare --threshold 0.15       # exit 1 on a >15% p50 regression
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import multiprocessing
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE_PATH = os.path.join(BASE_DIR, "utils", "json", "benchmark_baseline.json")
+
+RESOLUTIONS = {
+    "800x600": (800, 600),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+FPS = 60
+WARMUP_FRAMES = 5
+
+
+# ----------------------------
+# Benchmark assets (generated, so results don't depend on the media folder)
+# ----------------------------
+def make_assets(asset_dir):
+    """Write the test images and video clip used by the image and video effects."""
+    import cv2
+    import numpy as np
+
+    ys, xs = np.mgrid[0:600, 0:400]
+    left = np.dstack([(xs * 255 // 400), (ys * 255 // 600), np.full_like(xs, 128)]).astype(np.uint8)
+    right = np.ascontiguousarray(left[:, ::-1, ::-1])
+    assets = {
+        "image_left": os.path.join(asset_dir, "left.png"),
+        "image_right": os.path.join(asset_dir, "right.png"),
+        "video": os.path.join(asset_dir, "clip.mp4"),
+    }
+    cv2.imwrite(assets["image_left"], left)
+    cv2.imwrite(assets["image_right"], right)
+
+    size = (1280, 720)
+    writer = cv2.VideoWriter(assets["video"], cv2.VideoWriter_fourcc(*"mp4v"), 30, size)
+    for i in range(90):
+        frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        frame[:, :, 0] = (i * 3) % 256
+        cv2.circle(frame, (200 + i * 10, 360), 120, (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+    return assets
+
+
+# ----------------------------
+# Effects: setup(screen, assets, frames) -> draw(t)
+# ----------------------------
+def _pulsing_net(screen, assets, frames):
+    from utils.backgrounds import CircularPulsingNet
+    net = CircularPulsingNet()
+    return lambda t: net.draw(screen, t)
+
+
+def _psychedelic_background(screen, assets, frames):
+    from utils.backgrounds import draw_psychedelic_background
+    return lambda t: draw_psychedelic_background(screen, t)
+
+
+def _wavy_checker(screen, assets, frames):
+    from utils.utils_wavy_checker import run_wavy_checker
+    return lambda t: run_wavy_checker(screen, t)
+
+
+def _transition(cls, **kwargs):
+    def setup(screen, assets, frames):
+        from utils.backgrounds import draw_psychedelic_background
+        effect = cls(screen, start_time=0.0, duration=(frames + WARMUP_FRAMES + 1) / FPS, **kwargs)
+
+        def draw(t):
+            draw_psychedelic_background(screen, t)   # something to transition
+            effect.update(t)
+        return draw
+    return setup
+
+
+def _spin_fade(screen, assets, frames):
+    from utils.transitions import SpinFade
+    return _transition(SpinFade)(screen, assets, frames)
+
+
+def _swirl_effect(screen, assets, frames):
+    from utils.transitions import SwirlEffect
+    return _transition(SwirlEffect)(screen, assets, frames)
+
+
+def _swirl_effect_half(screen, assets, frames):
+    from utils.transitions import SwirlEffect
+    return _transition(SwirlEffect, quality=0.5)(screen, assets, frames)
+
+
+def _tv_countdown(screen, assets, frames):
+    from utils.tv_countdown import TVCountdownWithBurst
+    countdown = TVCountdownWithBurst(screen)
+    cycle = countdown.countdown_start * countdown.countdown_duration + countdown.burst_duration
+    return lambda t: countdown.update(t % (cycle - 1e-3))   # digits and burst, never done
+
+
+def _two_side_images(screen, assets, frames):
+    from utils.two_side_images import TwoSideImagesAnimator
+    width, height = screen.get_size()
+    segment = {
+        "image_left": assets["image_left"], "image_right": assets["image_right"],
+        "image_left_scale": 0.6, "image_right_scale": 0.6,
+        "start": 0.0, "end": 1e6, "image_slide_in": True,
+    }
+    animator = TwoSideImagesAnimator(screen, segment=segment, screen_width=width, screen_height=height)
+
+    def draw(t):
+        screen.fill((30, 30, 30))
+        animator.update(t % 4.0)   # slide-in, then zoom in/hold/out
+    return draw
+
+
+def _video_player(screen, assets, frames):
+    from utils.video_utils import VideoPlayer
+    player = VideoPlayer(screen, assets["video"], start_time=0.0, scale=0.5, realtime=False)
+
+    def draw(t):
+        screen.fill((30, 30, 30))
+        player.update(t)
+    draw.close = player.close
+    return draw
+
+
+def _embers(count):
+    def setup(screen, assets, frames):
+        from utils.particles import EmberOverlay
+        embers = EmberOverlay(screen, count=count, seed=1)
+
+        def draw(t):
+            screen.fill((0, 0, 0))
+            embers.update(t)
+        return draw
+    return setup
+
+
+def _glitch(screen, assets, frames):
+    from utils.glitch import GlitchOverlay
+    glitch = GlitchOverlay(screen, intensity=0.2, seed=1)
+
+    def draw(t):
+        screen.fill((30, 30, 30))
+        glitch.update(t)
+    return draw
+
+
+EFFECTS = {
+    "pulsing_net": _pulsing_net,
+    "psychedelic_background": _psychedelic_background,
+    "wavy_checker": _wavy_checker,
+    "spin_fade": _spin_fade,
+    "swirl_effect": _swirl_effect,
+    "swirl_effect_q50": _swirl_effect_half,
+    "tv_countdown": _tv_countdown,
+    "two_side_images": _two_side_images,
+    "video_player": _video_player,
+    "embers": _embers(250),
+    "embers_10k": _embers(10000),
+    "glitch": _glitch,
+}
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:   # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case):
+    """Benchmark one (effect, resolution) in the current process."""
+    effect, resolution, frames, assets = case
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sys.path.insert(0, BASE_DIR)
+    import numpy as np
+    import pygame
+
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode(RESOLUTIONS[resolution])
+        rss_before = _peak_rss_mb()
+        draw = EFFECTS[effect](screen, assets, frames)
+        for i in range(WARMUP_FRAMES):
+            draw(i / FPS)
+
+        latencies = np.empty(frames)
+        start = time.perf_counter()
+        for i in range(frames):
+            t0 = time.perf_counter()
+            draw((WARMUP_FRAMES + i) / FPS)
+            latencies[i] = time.perf_counter() - t0
+        total = time.perf_counter() - start
+        if hasattr(draw, "close"):
+            draw.close()
+        rss_after = _peak_rss_mb()
+    finally:
+        pygame.quit()
+
+    ms = latencies * 1000.0
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+    return {
+        "effect": effect,
+        "resolution": resolution,
+        "frames": frames,
+        "fps": frames / total,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(ms.max()),
+        "peak_rss_mb": rss_after,
+        "rss_growth_mb": None if rss_before is None else rss_after - rss_before,
+    }
+
+
+def run_benchmarks(effects=None, resolutions=None, frames=120):
+    """Run every (effect, resolution) pair, each in a fresh process. Returns the results dict."""
+    effects = effects or list(EFFECTS)
+    resolutions = resolutions or list(RESOLUTIONS)
+    results = []
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")   # inherited by the workers
+    with tempfile.TemporaryDirectory(prefix="bench_") as asset_dir:
+        assets = make_assets(asset_dir)
+        ctx = multiprocessing.get_context("spawn")
+        # maxtasksperchild=1: a clean interpreter (and peak RSS) per case
+        with ctx.Pool(1, maxtasksperchild=1) as pool:
+            for effect in effects:
+                for resolution in resolutions:
+                    result = pool.apply(run_case, ((effect, resolution, frames, assets),))
+                    print(f"[INFO] {effect:<24} {resolution:>8}: {result['fps']:8.1f} fps  "
+                          f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+                          f"peak {result['peak_rss_mb'] or 0:6.0f} MB")
+                    results.append(result)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "cpus": os.cpu_count()},
+        "frames": frames,
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=0.15):
+    """
+    Compare p50 frame latency against a baseline. Returns a list of regressions
+    (cases more than threshold slower); cases missing from either side are skipped.
+    """
+    base = {(r["effect"], r["resolution"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results["results"]:
+        b = base.get((r["effect"], r["resolution"]))
+        if not b or not b.get("p50_ms"):
+            continue
+        change = r["p50_ms"] / b["p50_ms"] - 1.0
+        r["baseline_p50_ms"] = b["p50_ms"]
+        r["p50_change"] = change
+        if change > threshold:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the visual effects headlessly.")
+    parser.add_argument("--effects", default=",".join(EFFECTS), help="comma-separated effect names")
+    parser.add_argument("--resolutions", default=",".join(RESOLUTIONS),
+                        help="comma-separated: " + ", ".join(RESOLUTIONS))
+    parser.add_argument("--frames", type=int, default=120, help="timed frames per case")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="baseline results JSON")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed p50 slowdown vs baseline before failing (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    effects = [e for e in args.effects.split(",") if e]
+    resolutions = [r for r in args.resolutions.split(",") if r]
+    unknown = [e for e in effects if e not in EFFECTS] + [r for r in resolutions if r not in RESOLUTIONS]
+    if unknown:
+        parser.error(f"unknown effect/resolution: {', '.join(unknown)}")
+
+    results = run_benchmarks(effects, resolutions, args.frames)
+
+    regressions = []
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"[ERROR] Baseline not found: {args.baseline}")
+            return 2
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"[ERROR] Regression: {r['effect']} {r['resolution']} p50 "
+                  f"{r['baseline_p50_ms']:.2f} -> {r['p50_ms']:.2f} ms ({r['p50_change']:+.0%})")
+        if not regressions:
+            print(f"[INFO] No regressions over {args.threshold:.0%} against {args.baseline}")
+
+    for path in filter(None, [args.output, args.baseline if args.save_baseline else None]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[INFO] Results written to {path}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, BASE_DIR)
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# utils/captions.py
+"""
+Caption lookup by time.
+
+CaptionTrack keeps the transcript's start times in a sorted NumPy array, so the
+caption active at any t is one binary search, in any order: playback, seeks,
+scrubbing and offline chunks all ask the same question.
+"""
+import numpy as np
+
+INF = float("inf")
+
+
+class CaptionTrack:
+    """
+    Captions from load_timestamps() output ([{"time": float, "text": str}, ...]).
+    A caption stays on screen from its time until the next caption's time.
+
+    Example usage:
+        captions = CaptionTrack(timestamps)
+        text = captions.update(current_time)     # once per frame
+        if captions.changed: ...                 # text differs from the previous frame
+        captions.next_change(current_time)       # when the text will change next
+    """
+    def __init__(self, timestamps):
+        starts, texts = [], []
+        for entry in timestamps:
+            try:
+                starts.append(float(entry["time"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+            texts.append(entry.get("text", ""))
+
+        # Stable sort: of several captions at the same time the later one wins, as before
+        order = np.argsort(np.asarray(starts, dtype=np.float64), kind="stable")
+        self.starts = np.asarray(starts, dtype=np.float64)[order]
+        self.texts = [texts[i] for i in order]
+
+        self.index = -1         # caption shown at the last update()/seek()
+        self.valid_from = -INF  # the current index stays valid for t in [valid_from, valid_until)
+        self.valid_until = self.starts[0] if len(self.starts) else INF
+        self.changed = False
+
+    def __len__(self):
+        return len(self.texts)
+
+    def index_at(self, t):
+        """Index of the caption active at t, or -1 before the first caption."""
+        return int(np.searchsorted(self.starts, t, side="right")) - 1
+
+    def text_at(self, t):
+        i = self.index_at(t)
+        return self.texts[i] if i >= 0 else ""
+
+    def next_change(self, t):
+        """Time at which the caption after t starts (INF after the last one)."""
+        i = self.index_at(t) + 1
+        return float(self.starts[i]) if i < len(self.starts) else INF
+
+    def seek(self, t):
+        """Jump to time t (forwards or backwards). Returns the caption text at t."""
+        i = self.index_at(t)
+        self.changed = i != self.index
+        self.index = i
+        self.valid_from = float(self.starts[i]) if i >= 0 else -INF
+        self.valid_until = float(self.starts[i + 1]) if i + 1 < len(self.starts) else INF
+        return self.texts[i] if i >= 0 else ""
+
+    def update(self, t):
+        """Caption text at t. Skips the search while t stays inside the current caption."""
+        if self.valid_from <= t < self.valid_until:
+            self.changed = False
+            return self.texts[self.index] if self.index >= 0 else ""
+        return self.seek(t)
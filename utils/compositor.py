@@ -0,0 +1,96 @@
+# utils/compositor.py
+"""
+Dirty-rectangle compositing for run_visuals.
+
+A frame is "static" when every active layer draws the same pixels as on the
+previous frame (full images, arrow overlays, held two-side images). For those
+frames the composite of the layers is cached once, and only the overlay
+rectangles (caption, elapsed counter) are restored, redrawn and presented
+with pygame.display.update(rects). Any animated layer falls back to a full
+redraw and flip.
+"""
+import pygame
+
+# Events whose drawing depends only on being active, not on current_time
+STATIC_EVENTS = ("full_image", "arrow_overlay")
+
+
+class DirtyRectCompositor:
+    """
+    Example usage (once per frame):
+        if compositor.begin_frame(static_key):
+            ...draw all layers...
+            compositor.cache_static()
+        compositor.add_overlay(screen.blit(text_surface, (50, 50)))
+        compositor.present()
+    """
+    def __init__(self, screen):
+        self.screen = screen
+        self.static_frame = None    # layers-only composite of the current static segment
+        self.static_key = None
+        self.overlay_rects = []     # rects drawn by overlays on the previous frame
+        self.damage = []
+        self.full = True
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def begin_frame(self, static_key):
+        """
+        static_key: hashable identity of the static layers on screen, or None if
+        any layer is animated. Returns True when the layers must be redrawn.
+        """
+        if static_key is None or static_key != self.static_key or self.static_frame is None:
+            self.static_key = static_key
+            self.static_frame = None
+            self.full = True
+            self.damage = []
+        else:
+            # Same static layers as last frame: only undo last frame's overlays
+            self.full = False
+            for rect in self.overlay_rects:
+                self.screen.blit(self.static_frame, rect, rect)
+            self.damage = list(self.overlay_rects)
+        self.overlay_rects = []
+        return self.full
+
+    def invalidate(self):
+        """Drop the cached static composite (e.g. after a seek): the next frame redraws fully."""
+        self.static_frame = None
+        self.static_key = None
+
+    def cache_static(self):
+        """Call after drawing the layers and before the overlays of a full frame."""
+        if self.static_key is not None:
+            self.static_frame = self.screen.copy()
+
+    def add_overlay(self, rect):
+        """Record a rect drawn on top of the layers this frame."""
+        if rect:
+            self.overlay_rects.append(pygame.Rect(rect))
+            self.damage.append(pygame.Rect(rect))
+
+    def present(self):
+        """Show the frame: full flip after a redraw, otherwise only the damaged rects."""
+        if self.full:
+            self.full_frames += 1
+            pygame.display.flip()
+        else:
+            self.partial_frames += 1
+            bounds = self.screen.get_rect()
+            pygame.display.update([r.clip(bounds) for r in self.damage])
+
+    def stats(self):
+        return {"full_frames": self.full_frames, "partial_frames": self.partial_frames}
+
+
+def static_layer_key(active, is_static):
+    """
+    Identity of the active layers if all of them are static, else None.
+    is_static(ev) decides per event (e.g. a two-side animator that is done).
+    """
+    key = []
+    for ev in active:
+        if not is_static(ev):
+            return None
+        key.append(ev.index)
+    return tuple(key)
@@ -1,5 +1,6 @@
 import pygame
 import os
+from utils.asset_cache import load_surface
 
 def render_full_image(screen, params, current_time):
     """
@@ -24,19 +25,14 @@ def render_full_image(screen, params, current_time):
         print(f"[WARN] Image file not found: {image_path}")
         return
 
-    # Load image
+    # Load (and scale) image through the shared cache: decoded once, not every frame
+    scale = float(params.get("scale", 1.0))
     try:
-        image = pygame.image.load(image_path).convert_alpha()
+        image = load_surface(image_path, scale=scale)
     except Exception as e:
         print(f"[ERROR] Failed to load image '{image_path}': {e}")
         return
 
-    # Scale image if requested
-    scale = float(params.get("scale", 1.0))
-    if scale != 1.0:
-        w, h = image.get_size()
-        image = pygame.transform.smoothscale(image, (int(w*scale), int(h*scale)))
-
     # Position image
     x = params.get("x")
     y = params.get("y")
@@ -0,0 +1,85 @@
+# utils/glitch.py
+"""
+Vectorized glitch effect (row tearing plus RGB channel offsets).
+
+The effect works in place on a surface's pixels: the torn rows are one gather
+over the selected rows, and the channel offsets are slice copies from a pixel
+buffer kept between frames. The random pattern of a frame comes from a
+generator seeded with (seed, frame), so a render shows the same glitches at the
+same time whatever order frames are drawn in.
+"""
+import numpy as np
+import pygame
+
+ROW_SHIFT = 20          # max horizontal shift of a torn row (px)
+CHANNEL_SHIFT = 5       # max vertical offset of a color channel (px)
+CHANNEL_CHANCE = 0.3    # share of frames with channel offsets
+GLITCH_RATE = 30        # glitch patterns per second in run_visuals
+
+
+class GlitchEngine:
+    """
+    Example usage:
+        glitch = GlitchEngine(seed=3)
+        glitch.apply(screen, intensity=0.1, frame=frame_number)
+    """
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.buffer = None      # (h, w, 3) copy for the channel offsets, reused
+        self.columns = None     # 0..w-1, reused
+
+    def _buffers(self, shape):
+        if self.buffer is None or self.buffer.shape != shape:
+            self.buffer = np.empty(shape, dtype=np.uint8)
+            self.columns = np.arange(shape[1])
+        return self.buffer, self.columns
+
+    def apply(self, surface, intensity=0.1, frame=0):
+        """
+        Glitch surface in place. intensity: 0-1, fraction of rows shifted.
+        frame picks the random pattern: the same frame always glitches the same way.
+        """
+        rng = np.random.default_rng((self.seed, frame))
+        pixels = pygame.surfarray.pixels3d(surface).transpose(1, 0, 2)   # (h, w, 3) view
+        h, w = pixels.shape[:2]
+        buffer, columns = self._buffers(pixels.shape)
+
+        # Random horizontal shifts: each torn row is drawn shifted over itself
+        rows = np.flatnonzero(rng.random(h) < intensity)
+        if rows.size:
+            shifts = rng.integers(-ROW_SHIFT, ROW_SHIFT + 1, rows.size)
+            source = columns - shifts[:, None]
+            source = np.where((source >= 0) & (source < w), source, columns)   # uncovered pixels stay
+            pixels[rows] = pixels[rows[:, None], source]
+
+        # RGB channel offsets (vertical, wrapping around)
+        if rng.random() < CHANNEL_CHANCE:
+            np.copyto(buffer, pixels)
+            for channel, offset in enumerate(rng.integers(-CHANNEL_SHIFT, CHANNEL_SHIFT + 1, 3)):
+                k = int(offset) % h    # numpy.roll by offset, as two slice copies
+                if k:
+                    pixels[k:, :, channel] = buffer[:h - k, :, channel]
+                    pixels[:k, :, channel] = buffer[h - k:, :, channel]
+        del pixels   # release the surface lock
+
+
+class GlitchOverlay:
+    """
+    "glitch" schedule event: glitches whatever is already drawn on screen from
+    start_time on, with a new pattern GLITCH_RATE times per second.
+
+    Example usage:
+        glitch = GlitchOverlay(screen, start_time=4.0, intensity=0.2, seed=1)
+        glitch.update(current_time)
+    """
+    def __init__(self, screen, start_time=0.0, intensity=0.1, seed=0):
+        self.screen = screen
+        self.start_time = start_time
+        self.intensity = intensity
+        self.engine = GlitchEngine(seed)
+
+    def update(self, current_time):
+        if current_time < self.start_time:
+            return
+        frame = int((current_time - self.start_time) * GLITCH_RATE)
+        self.engine.apply(self.screen, self.intensity, frame)
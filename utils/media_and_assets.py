@@ -2,6 +2,7 @@ import pygame
 import os
 import subprocess
 import sys
+from utils.asset_cache import load_surface
 
 # -----------------------------
 # Media Conversion Utilities
@@ -53,18 +54,13 @@ def convert_mkv_to_mp4_and_mp3(input_file, output_mp4=None, output_mp3=None):
 
 def load_image(path, scale=None):
     """
-    Load an image with optional scaling.
-    Returns a Pygame Surface.
+    Load an image with optional scaling to a (width, height) size.
+    Returns a Pygame Surface shared through utils.asset_cache (copy before drawing on it).
     """
     if not os.path.isfile(path):
         raise FileNotFoundError(f"Image file not found: {path}")
 
-    image = pygame.image.load(path).convert_alpha()
-
-    if scale is not None:
-        image = pygame.transform.smoothscale(image, scale)
-
-    return image
+    return load_surface(path, scale=tuple(scale) if scale is not None else None)
 
 
 def load_large_gear():
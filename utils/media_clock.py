@@ -0,0 +1,93 @@
+# utils/media_clock.py
+"""
+Playback clock that follows the voiceover instead of the wall.
+
+pygame.mixer.music.get_pos() is the real audio position, but it only advances
+once per audio buffer (tens of ms) and starts late by the device's start-up
+latency. MediaClock runs on perf_counter between audio updates and, each time
+the audio position steps, slews towards it (small drift) or jumps to it
+(seek / stall), so every reader sees a smooth, monotonic time that stays
+locked to what is being heard.
+"""
+import time
+import pygame
+
+
+def music_position():
+    """Seconds played by pygame.mixer.music since play(), or None when it is not playing."""
+    if not pygame.mixer.get_init():
+        return None
+    ms = pygame.mixer.music.get_pos()
+    return ms / 1000.0 if ms >= 0 else None
+
+
+class MediaClock:
+    """
+    Example usage:
+        pygame.mixer.music.play()
+        clock = MediaClock(music_position)
+        current_time = clock.time()              # once per frame, from every component
+
+        pygame.mixer.music.play(start=12.0)      # after a seek
+        clock.start(12.0)
+
+    Without a position source (no voiceover) it is a plain monotonic clock.
+    """
+    SNAP_THRESHOLD = 0.25   # s of error treated as a seek/stall: jump instead of slewing
+    CORRECTION = 0.1        # fraction of the measured drift removed per audio update
+    START_TIMEOUT = 1.0     # s to wait for audio before running on the wall clock alone
+
+    def __init__(self, position=None, wall=time.perf_counter):
+        self.position = position
+        self.wall = wall
+        self.start(0.0)
+
+    def start(self, offset=0.0):
+        """(Re)start at media time offset, i.e. right after play(start=offset)."""
+        self.offset = offset
+        self.base = offset              # media time at wall_base
+        self.wall_base = self.wall()
+        self.started = self.position is None
+        self.last_sample = None
+        self.last_time = offset
+        self.drift = 0.0                # last measured audio - clock error (s)
+
+    def _sample(self, now):
+        sample = self.position()
+        if not self.started:
+            # Hold at offset until the device actually starts playing
+            if sample is not None and sample > 0:
+                self.started = True
+                self.base = self.offset + sample
+                self.wall_base = now
+                self.last_sample = sample
+            elif now - self.wall_base > self.START_TIMEOUT:
+                self.started = True
+                self.wall_base = now
+            return False
+
+        if sample is None or sample == self.last_sample:
+            return False
+        # The audio position just stepped: that edge is the most accurate reading
+        self.last_sample = sample
+        estimate = self.base + (now - self.wall_base)
+        self.drift = self.offset + sample - estimate
+        if abs(self.drift) > self.SNAP_THRESHOLD:
+            self.base += self.drift
+            return True
+        self.base += self.drift * self.CORRECTION
+        return False
+
+    def time(self):
+        """Current media time in seconds."""
+        now = self.wall()
+        snapped = False
+        if self.position is not None:
+            snapped = self._sample(now)
+            if not self.started:
+                return self.offset
+        t = self.base + (now - self.wall_base)
+        if t < self.last_time and not snapped:
+            t = self.last_time      # slewing never steps time backwards
+        self.last_time = t
+        return t
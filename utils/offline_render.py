@@ -0,0 +1,190 @@
+# utils/offline_render.py
+"""
+Headless, faster-than-realtime render of an event schedule to a video file.
+
+Usage (from the project root):
+    python -m utils.offline_render output.mp4 --settings utils/json/default_settings.json --fps 60
+    python -m utils.offline_render output.mp4 --workers 8     # parallel chunked render
+"""
+import os
+import sys
+import json
+import math
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SETTINGS_PATH = os.path.join(BASE_DIR, "utils", "json", "default_settings.json")
+PATH_KEYS = ["font_name", "timestamps_file_word", "timestamps_file_sentence",
+             "event_schedule_path", "voiceover_path", "cache_dir"]
+
+
+def use_dummy_drivers():
+    """Run SDL without a display or sound card (must be called before pygame.init)."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def load_render_settings(settings_path=DEFAULT_SETTINGS_PATH):
+    """Load a settings JSON and resolve its relative paths against the project root."""
+    with open(settings_path, "r", encoding="utf-8-sig") as f:
+        settings = json.load(f)
+    for key in PATH_KEYS:
+        val = settings.get(key)
+        if val and not os.path.isabs(val):
+            settings[key] = os.path.join(BASE_DIR, val)
+    return settings
+
+
+def load_settings_timestamps(settings):
+    """Load the word or sentence transcript selected by settings['timestamp_mode']."""
+    from utils.video_audio import load_timestamps
+
+    mode = settings.get("timestamp_mode", "word")
+    path = settings.get("timestamps_file_word") if mode == "word" else settings.get("timestamps_file_sentence")
+    if not path or not os.path.exists(path):
+        print(f"[WARN] Timestamps file missing: {path}")
+        return []
+    return load_timestamps(path)
+
+
+def render_offline(output_path, settings, fps=60, start_frame=0, end_frame=None, audio=True, keyint=None):
+    """
+    Render the whole schedule in settings to output_path with a fixed 1/fps timestep.
+    Runs under the SDL dummy video driver, so it works on machines without a display.
+    start_frame/end_frame restrict the render to one chunk of the timeline.
+    """
+    use_dummy_drivers()
+    import pygame
+    from utils.visuals import run_visuals
+
+    pygame.init()
+    screen = pygame.display.set_mode((1600, 600))
+    try:
+        timestamps = load_settings_timestamps(settings)
+        run_visuals(
+            timestamps,
+            [],
+            settings.get("font_name"),
+            settings.get("font_size", 24),
+            settings,
+            screen=screen,
+            output_path=output_path,
+            fps=fps,
+            start_frame=start_frame,
+            end_frame=end_frame,
+            audio=audio,
+            keyint=keyint
+        )
+    finally:
+        pygame.quit()
+
+
+# ----------------------------
+# Parallel chunked render
+# ----------------------------
+def count_render_frames(settings, fps=60):
+    """Number of frames a serial offline render of settings produces."""
+    from utils.visuals import schedule_end_time
+
+    events = []
+    events_file = settings.get("event_schedule_path")
+    if events_file and os.path.exists(events_file):
+        with open(events_file, "r", encoding="utf-8-sig") as f:
+            events = json.load(f).get("events", [])
+    end_time = schedule_end_time(events, load_settings_timestamps(settings))
+    # Frames 0..k are drawn, k being the first frame whose time is past end_time
+    return int(math.floor(end_time * fps)) + 2
+
+
+def split_frames(total_frames, chunks, keyint):
+    """
+    Cut [0, total_frames) into at most `chunks` contiguous ranges whose boundaries
+    fall on multiples of keyint, so every chunk starts on a regular keyframe.
+    """
+    gops = max(1, math.ceil(total_frames / keyint))
+    chunks = max(1, min(chunks, gops))
+    ranges = []
+    for i in range(chunks):
+        start = (gops * i // chunks) * keyint
+        end = min((gops * (i + 1) // chunks) * keyint, total_frames)
+        if end > start:
+            ranges.append((start, end))
+    return ranges
+
+
+def _render_chunk(job):
+    """Worker process entry point: render one frame range to its own segment file."""
+    settings, segment_path, fps, start_frame, end_frame, keyint = job
+    render_offline(segment_path, settings, fps=fps, start_frame=start_frame, end_frame=end_frame,
+                   audio=False, keyint=keyint)
+    return segment_path
+
+
+def render_parallel(output_path, settings, fps=60, workers=None, keyint_seconds=2.0):
+    """
+    Render the schedule in settings across worker processes and join the result.
+
+    The timeline is split into keyframe-aligned frame ranges (about two per worker
+    so uneven chunks balance out). Each worker runs its own headless pygame and
+    encodes its range with the same fixed GOP; the segments are then concatenated
+    with stream copy and the voiceover muxed once over the whole video. Every frame
+    is a function of its timeline time, so the output matches a serial render.
+    """
+    from utils.video_writer import concat_videos
+    from utils.profiler import FrameProfiler
+
+    workers = workers or os.cpu_count() or 1
+    keyint = max(1, int(round(keyint_seconds * fps)))
+    total_frames = count_render_frames(settings, fps)
+    ranges = split_frames(total_frames, workers * 2, keyint)
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(out_dir, exist_ok=True)
+    segment_dir = tempfile.mkdtemp(prefix=".render_", dir=out_dir)
+    ext = os.path.splitext(output_path)[1] or ".mp4"
+    # Each chunk traces to its own file; they are merged into profile_trace at the end
+    trace_path = settings.get("profile_trace")
+    trace_paths = [os.path.join(segment_dir, f"trace_{i:04d}.json") for i in range(len(ranges))]
+    jobs = [(dict(settings, profile_trace=trace_paths[i]) if trace_path else settings,
+             os.path.join(segment_dir, f"segment_{i:04d}{ext}"), fps, start, end, keyint)
+            for i, (start, end) in enumerate(ranges)]
+    print(f"[INFO] Parallel render: {total_frames} frames in {len(jobs)} chunks on {workers} workers")
+
+    try:
+        # spawn: every worker gets a fresh SDL/pygame state
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(min(workers, len(jobs))) as pool:
+            segments = pool.map(_render_chunk, jobs, chunksize=1)
+        ret = concat_videos(segments, output_path, audio_path=settings.get("voiceover_path"))
+        if trace_path:
+            FrameProfiler.merge_traces(trace_paths, trace_path,
+                                       labels=[f"frames {start}-{end}" for start, end in ranges])
+    finally:
+        shutil.rmtree(segment_dir, ignore_errors=True)
+    if ret == 0:
+        print(f"[INFO] Rendered {total_frames} frames to {output_path}")
+    return ret
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render an event schedule to video without a display.")
+    parser.add_argument("output", help="output video file (e.g. render.mp4)")
+    parser.add_argument("--settings", default=DEFAULT_SETTINGS_PATH, help="settings JSON to render")
+    parser.add_argument("--fps", type=int, default=60, help="output frame rate / timestep")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="render chunks in this many processes (0 = one per CPU core)")
+    args = parser.parse_args(argv)
+
+    settings = load_render_settings(args.settings)
+    if args.workers == 1:
+        render_offline(args.output, settings, fps=args.fps)
+    else:
+        render_parallel(args.output, settings, fps=args.fps, workers=args.workers or None)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, BASE_DIR)
+    main()
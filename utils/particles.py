@@ -0,0 +1,188 @@
+# utils/particles.py
+"""
+Vectorized particle engine (fireplace embers).
+
+Particle state is a structure of NumPy arrays (position, velocity, alpha,
+radius, palette color), so updating and respawning 10k+ particles is a handful
+of array operations per step. Drawing never allocates: every particle is one
+blit of a pre-rendered circle sprite picked by (radius, alpha level, color),
+all submitted in a single Surface.blits() call. Sprites are premultiplied and
+blitted with BLEND_PREMULTIPLIED, about twice as fast as plain alpha blits.
+
+Motion is in the units of the original per-ember scripts (pixels and alpha per
+frame at 60 fps) and advances in fixed steps, so a seeded system shows the same
+particles at the same time in live playback, seeks and offline chunks. Every
+SNAPSHOT_STEPS steps the state is kept, so a seek replays at most that many
+steps from the nearest snapshot instead of from the start.
+"""
+from itertools import repeat
+import numpy as np
+import pygame
+
+STEP_RATE = 60          # simulation steps per second
+ALPHA_LEVELS = 32       # sprite alpha quantization
+PALETTE_SIZE = 8        # red-orange glow colors per system
+MAX_RADIUS = 6
+SNAPSHOT_STEPS = 600    # keep the state every 10 s of simulation for seeks
+
+
+def ember_palette(rng, size=PALETTE_SIZE):
+    """Red-orange glow colors, as the per-ember scripts pick them."""
+    return [(int(r), int(g), 0) for r, g in zip(rng.integers(200, 256, size), rng.integers(50, 121, size))]
+
+
+def make_sprites(palette, max_radius=MAX_RADIUS, alpha_levels=ALPHA_LEVELS):
+    """
+    Flat list of circle sprites indexed by (radius * alpha_levels + level) * len(palette) + color.
+    Radius 0 and alpha level 0 are None: nothing to draw. Sprites are premultiplied.
+    """
+    convert = pygame.display.get_surface() is not None
+    sprites = []
+    for radius in range(max_radius + 1):
+        for level in range(alpha_levels):
+            alpha = round(level * 255 / (alpha_levels - 1))
+            for color in palette:
+                if radius == 0 or level == 0:
+                    sprites.append(None)
+                    continue
+                sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+                if convert:
+                    sprite = sprite.convert_alpha()
+                sprites.append(sprite.premul_alpha())
+    return sprites
+
+
+class ParticleSystem:
+    """
+    Rising embers on a surface of the given size.
+
+    Example usage:
+        embers = ParticleSystem(screen.get_size(), count=250, seed=1)
+        embers.step()                       # once per 60 fps frame (scripts)
+        embers.advance(current_time - start) # or: follow a timeline (run_visuals)
+        embers.draw(screen)
+    """
+    def __init__(self, size, count=250, seed=None, high_start_chance=0.15, high_margin=50,
+                 high_speed=(-4.0, -1.5)):
+        self.width, self.height = size
+        self.count = count
+        self.seed = seed
+        self.high_start_chance = high_start_chance   # share of embers starting mid-screen and rising faster
+        self.high_margin = high_margin               # those start in [high_margin, height - high_margin]
+        self.high_speed = high_speed                 # ... with vy in this range
+
+        self.x = np.zeros(count, dtype=np.float32)
+        self.y = np.zeros(count, dtype=np.float32)
+        self.vx = np.zeros(count, dtype=np.float32)
+        self.vy = np.zeros(count, dtype=np.float32)
+        self.alpha = np.zeros(count, dtype=np.float32)
+        self.radius = np.zeros(count, dtype=np.float32)
+        self.color = np.zeros(count, dtype=np.intp)
+        self.snapshots = {}     # steps -> state at that step, every SNAPSHOT_STEPS
+        self.reset()
+
+    def reset(self):
+        """Restart from step 0: reseed and respawn every particle."""
+        self.rng = np.random.default_rng(self.seed)
+        palette = ember_palette(self.rng)
+        if palette != getattr(self, "palette", None):
+            self.palette = palette
+            self.sprites = make_sprites(palette)   # same seed, same palette: keep the sprites
+        self.steps = 0
+        self._spawn(np.ones(self.count, dtype=bool))
+
+    def resize(self, size):
+        """New surface size: every particle respawns inside it."""
+        self.width, self.height = size
+        self.snapshots.clear()
+        self._spawn(np.ones(self.count, dtype=bool))
+
+    def _arrays(self):
+        return self.x, self.y, self.vx, self.vy, self.alpha, self.radius, self.color
+
+    def _save_snapshot(self):
+        self.snapshots[self.steps] = ([a.copy() for a in self._arrays()], self.rng.bit_generator.state)
+
+    def _restore_snapshot(self, steps):
+        arrays, rng_state = self.snapshots[steps]
+        for a, saved in zip(self._arrays(), arrays):
+            np.copyto(a, saved)
+        self.rng.bit_generator.state = rng_state
+        self.steps = steps
+
+    def _spawn(self, mask):
+        n = int(np.count_nonzero(mask))
+        if n == 0:
+            return
+        rng = self.rng
+        high = rng.random(n) < self.high_start_chance
+        low_y = rng.uniform(self.height - 50, self.height, n)
+        high_y = rng.uniform(self.high_margin, max(self.height - self.high_margin, self.high_margin), n)
+        self.y[mask] = np.where(high, high_y, low_y)
+        self.vy[mask] = np.where(high, rng.uniform(*self.high_speed, n), rng.uniform(-3.0, -0.5, n))
+        self.x[mask] = rng.uniform(0, self.width, n)
+        self.vx[mask] = rng.uniform(-1.0, 1.0, n)
+        self.radius[mask] = rng.uniform(2, MAX_RADIUS, n)
+        self.alpha[mask] = rng.integers(150, 256, n)
+        self.color[mask] = rng.integers(0, len(self.palette), n)
+
+    def step(self, n=1):
+        """Advance n fixed 1/60 s steps: move, fade, shrink, respawn the dead."""
+        for _ in range(n):
+            self.x += self.vx
+            self.y += self.vy
+            self.alpha -= self.rng.uniform(1, 3, self.count).astype(np.float32)
+            np.maximum(self.radius - 0.02, 0, out=self.radius)
+            dead = (self.alpha <= 0) | (self.y < 0) | (self.radius <= 0)
+            self._spawn(dead)
+            self.steps += 1
+            if self.steps % SNAPSHOT_STEPS == 0 and self.steps not in self.snapshots:
+                self._save_snapshot()
+
+    def advance(self, elapsed):
+        """Step to elapsed seconds since the start, from the nearest snapshot at or before it when that is closer."""
+        target = max(int(elapsed * STEP_RATE), 0)
+        if target < self.steps or target - self.steps > SNAPSHOT_STEPS:
+            known = max((s for s in self.snapshots if s <= target), default=0)
+            if known > self.steps or target < self.steps:
+                if known:
+                    self._restore_snapshot(known)
+                else:
+                    self.reset()
+        self.step(target - self.steps)
+
+    def draw(self, surface):
+        radius = self.radius.astype(np.intp)
+        level = np.clip(self.alpha * ((ALPHA_LEVELS - 1) / 255.0) + 0.5, 0, ALPHA_LEVELS - 1).astype(np.intp)
+        visible = np.flatnonzero((radius > 0) & (level > 0))
+        if visible.size == 0:
+            return
+        index = (radius[visible] * ALPHA_LEVELS + level[visible]) * len(self.palette) + self.color[visible]
+        left = (self.x[visible] - self.radius[visible]).astype(np.intp)
+        top = (self.y[visible] - self.radius[visible]).astype(np.intp)
+        # Streamed through zip instead of a list of 10k tuples: nothing for the GC to chase
+        surface.blits(zip(map(self.sprites.__getitem__, index.tolist()), zip(left.tolist(), top.tolist()),
+                          repeat(None), repeat(pygame.BLEND_PREMULTIPLIED)), doreturn=False)
+
+
+class EmberOverlay:
+    """
+    "embers" schedule event: a seeded ParticleSystem drawn over the left panel
+    from start_time for duration seconds.
+
+    Example usage:
+        embers = EmberOverlay(screen, start_time=2.0, count=2000, seed=7)
+        embers.update(current_time)
+    """
+    def __init__(self, screen, start_time=0.0, count=250, seed=0, high_start_chance=0.15):
+        self.screen = screen
+        self.start_time = start_time
+        self.particles = ParticleSystem(screen.get_size(), count=count, seed=seed,
+                                        high_start_chance=high_start_chance)
+
+    def update(self, current_time):
+        if current_time < self.start_time:
+            return
+        self.particles.advance(current_time - self.start_time)
+        self.particles.draw(self.screen)
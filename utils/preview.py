@@ -0,0 +1,85 @@
+# utils/preview.py
+"""
+Scrub/seek controls for run_visuals preview mode (settings["preview"]).
+
+Keys:
+    Left / Right            -5 s / +5 s   (Shift: 1 s, Ctrl: 30 s)
+    Page Up / Page Down     previous / next event boundary
+    Home / End              start / end of the schedule
+    Space                   pause / resume
+Mouse:
+    click or drag on the scrub bar at the bottom of the window; audio resumes on release
+"""
+import pygame
+
+SEEK_STEP = 5.0
+SEEK_STEP_FINE = 1.0
+SEEK_STEP_COARSE = 30.0
+
+
+def seek_step(mods):
+    """Seek distance for an arrow key press with the given key modifiers."""
+    if mods & pygame.KMOD_SHIFT:
+        return SEEK_STEP_FINE
+    if mods & pygame.KMOD_CTRL:
+        return SEEK_STEP_COARSE
+    return SEEK_STEP
+
+
+def key_target(key, mods, t, timeline, end_time):
+    """Timeline time a seek key jumps to from t, or None if key is not a seek key."""
+    if key == pygame.K_LEFT:
+        target = t - seek_step(mods)
+    elif key == pygame.K_RIGHT:
+        target = t + seek_step(mods)
+    elif key == pygame.K_PAGEUP:
+        target = timeline.prev_change(t - 0.05)   # a little slack so repeated presses keep moving
+    elif key == pygame.K_PAGEDOWN:
+        target = min(timeline.next_change(t), end_time)
+    elif key == pygame.K_HOME:
+        target = 0.0
+    elif key == pygame.K_END:
+        target = end_time
+    else:
+        return None
+    return min(max(target, 0.0), end_time)
+
+
+class ScrubBar:
+    """
+    Timeline bar along the bottom of the window: elapsed part, event start ticks,
+    and the playhead.
+
+    Example usage:
+        bar = ScrubBar(screen.get_rect(), end_time, [ev.start for ev in timeline])
+        rect = bar.draw(screen, current_time)
+        if bar.hit(mouse_pos): seek_to(bar.time_at(mouse_pos[0]))
+    """
+    def __init__(self, window_rect, end_time, markers=(), height=12):
+        self.rect = pygame.Rect(window_rect.x, window_rect.bottom - height, window_rect.width, height)
+        self.end_time = max(end_time, 1e-6)
+        self.markers = sorted({m for m in markers if 0 <= m <= end_time})
+
+        # Track and ticks never change: draw them once
+        self.track = pygame.Surface(self.rect.size)
+        self.track.fill((50, 50, 50))
+        for m in self.markers:
+            self.track.fill((200, 200, 80), (self._x(m) - self.rect.x, 0, 1, height))
+
+    def _x(self, t):
+        return self.rect.x + int(self.rect.width * min(max(t / self.end_time, 0.0), 1.0))
+
+    def time_at(self, x):
+        return (x - self.rect.x) / self.rect.width * self.end_time
+
+    def hit(self, pos):
+        return self.rect.collidepoint(pos)
+
+    def draw(self, surface, t):
+        """Draw the bar at time t. Returns its Rect."""
+        surface.blit(self.track, self.rect)
+        x = self._x(t)
+        played = pygame.Rect(self.rect.x, self.rect.y + self.rect.height // 2 - 1, x - self.rect.x, 3)
+        surface.fill((220, 60, 60), played)
+        surface.fill((255, 255, 255), (x - 1, self.rect.y, 3, self.rect.height))
+        return self.rect
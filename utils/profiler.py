@@ -0,0 +1,186 @@
+# utils/profiler.py
+"""
+Per-event frame-time instrumentation for run_visuals.
+
+Every event drawn in a frame is timed under its layer (background, middle,
+overlay) plus the text overlay and the present/encode step. A rolling window
+feeds an on-screen HUD with p50/p95/max per layer, and every measurement can
+be written as a Chrome trace-event file (open it in chrome://tracing or
+ui.perfetto.dev) with the event index and schedule time attached.
+"""
+import json
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+import numpy as np
+import pygame
+from utils.text_cache import get_glyph_atlas
+
+LAYER_NAMES = ("background", "middle", "overlay")
+HUD_LAYERS = LAYER_NAMES + ("text", "present", "frame")
+
+_NULL = nullcontext()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "layer", "index", "start")
+
+    def __init__(self, profiler, name, layer, index):
+        self.profiler = profiler
+        self.name = name
+        self.layer = layer
+        self.index = index
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._record(self.name, self.layer, self.index, self.start, time.perf_counter())
+        return False
+
+
+class FrameProfiler:
+    """
+    Example usage (once per frame):
+        profiler.begin_frame(current_time)
+        with profiler.measure(ev.type, "middle", ev.index):
+            ...draw the event...
+        profiler.end_frame()
+        profiler.write_trace("render.trace.json")
+
+    A disabled profiler returns a shared no-op context manager from measure().
+    """
+    def __init__(self, enabled=True, window=240, trace=True, hud_visible=False):
+        self.enabled = enabled
+        self.trace = trace and enabled
+        self.hud_visible = hud_visible
+        self.origin = time.perf_counter()
+        self.samples = {layer: deque(maxlen=window) for layer in HUD_LAYERS}
+        self.events = []            # Chrome trace events
+        self.frame_layers = {}
+        self.frame_start = None
+        self.schedule_time = 0.0
+        self.frames = 0
+        self._hud_stats = {}
+
+    def _us(self, t):
+        return (t - self.origin) * 1e6
+
+    def begin_frame(self, schedule_time):
+        if not self.enabled:
+            return
+        self.schedule_time = schedule_time
+        self.frame_layers = dict.fromkeys(HUD_LAYERS, 0.0)
+        self.frame_start = time.perf_counter()
+
+    def measure(self, name, layer, index=None):
+        """Context manager timing one draw call of the current frame."""
+        if not self.enabled:
+            return _NULL
+        return _Span(self, name, layer, index)
+
+    def _record(self, name, layer, index, start, end):
+        self.frame_layers[layer] = self.frame_layers.get(layer, 0.0) + (end - start)
+        if self.trace:
+            args = {"schedule_time": round(self.schedule_time, 4)}
+            if index is not None:
+                args["event_index"] = index
+            self.events.append({
+                "name": name if index is None else f"{name}#{index}",
+                "cat": layer, "ph": "X", "pid": os.getpid(), "tid": 0,
+                "ts": self._us(start), "dur": (end - start) * 1e6, "args": args,
+            })
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        end = time.perf_counter()
+        self.frame_layers["frame"] = end - self.frame_start
+        for layer, seconds in self.frame_layers.items():
+            if layer in self.samples:
+                self.samples[layer].append(seconds * 1000.0)
+        if self.trace:
+            self.events.append({
+                "name": "frame", "cat": "frame", "ph": "X", "pid": os.getpid(), "tid": 1,
+                "ts": self._us(self.frame_start), "dur": (end - self.frame_start) * 1e6,
+                "args": {"frame": self.frames, "schedule_time": round(self.schedule_time, 4)},
+            })
+        self.frames += 1
+        self.frame_start = None
+
+    def layer_stats(self):
+        """{layer: (p50, p95, max)} in milliseconds over the rolling window."""
+        stats = {}
+        for layer, values in self.samples.items():
+            if values:
+                arr = np.fromiter(values, dtype=np.float64, count=len(values))
+                p50, p95 = np.percentile(arr, (50, 95))
+                stats[layer] = (float(p50), float(p95), float(arr.max()))
+        return stats
+
+    def toggle_hud(self):
+        self.hud_visible = not self.hud_visible
+
+    def draw_hud(self, surface, font, pos=(10, 90), refresh_every=15):
+        """Draw p50/p95/max per layer onto surface. Returns the drawn Rect, or None if hidden."""
+        if not (self.enabled and self.hud_visible):
+            return None
+        if self.frames % refresh_every == 0 or not self._hud_stats:
+            self._hud_stats = self.layer_stats()
+
+        atlas = get_glyph_atlas(font, (255, 255, 0))
+        rows = [("ms", "p50", "p95", "max")]
+        for layer in HUD_LAYERS:
+            if layer in self._hud_stats:
+                rows.append((layer,) + tuple(f"{v:.2f}" for v in self._hud_stats[layer]))
+
+        # Proportional font: right-align each number column on its own edge
+        name_w = max(atlas.width(row[0]) for row in rows) + 10
+        col_w = atlas.width("000.00") + 10
+        rect = pygame.Rect(pos[0], pos[1], name_w + 3 * col_w + 10, atlas.height * len(rows) + 10)
+        surface.fill((0, 0, 0), rect)
+        for i, row in enumerate(rows):
+            y = rect.y + 5 + i * atlas.height
+            atlas.blit(surface, row[0], (rect.x + 5, y))
+            for j, value in enumerate(row[1:]):
+                right = rect.x + 5 + name_w + (j + 1) * col_w
+                atlas.blit(surface, value, (right - atlas.width(value), y))
+        return rect
+
+    def write_trace(self, path):
+        """Write the recorded measurements as a Chrome trace-event JSON file."""
+        out_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(out_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        print(f"[INFO] Frame trace ({len(self.events)} spans) written to {path}")
+
+    @staticmethod
+    def merge_traces(paths, path, labels=None):
+        """
+        Combine trace files (e.g. one per render chunk) into one Chrome trace.
+        Each source becomes its own process row (pool workers reuse pids across
+        chunks); labels name those rows in the viewer.
+        """
+        events = []
+        for i, source in enumerate(paths):
+            try:
+                with open(source, "r", encoding="utf-8") as f:
+                    chunk = json.load(f).get("traceEvents", [])
+            except (OSError, ValueError):
+                continue
+            for event in chunk:
+                event["pid"] = i + 1
+            if labels:
+                events.append({"name": "process_name", "ph": "M", "pid": i + 1, "args": {"name": labels[i]}})
+            events.extend(chunk)
+        out_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(out_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"[INFO] Merged {len(paths)} frame traces ({len(events)} spans) into {path}")
+
+    def summary(self):
+        return {layer: {"p50": s[0], "p95": s[1], "max": s[2]} for layer, s in self.layer_stats().items()}
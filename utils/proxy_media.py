@@ -0,0 +1,109 @@
+# utils/proxy_media.py
+"""
+Low-resolution proxy copies of the videos a schedule plays.
+
+Preview sessions decode every centered_video frame at full source
+resolution only to shrink it to a fraction of an 800x600 panel. A proxy is the
+same clip transcoded once to exactly that target size in MJPEG (every frame a
+keyframe: cheap to decode and to seek), without audio. Proxies are keyed by the
+source's content hash and the target geometry, so an edited source or a new
+scale gets a new proxy. Offline renders, plain live sessions and recorded
+sessions keep decoding the originals.
+
+Usage (from the project root), to build proxies ahead of a preview:
+    python -m utils.proxy_media media/event_schedule.json
+"""
+import os
+import sys
+import hashlib
+import argparse
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, "cache")
+PROXY_VERSION = 1
+PROXY_QUALITY = 3    # MJPEG -q:v (2 = best, 31 = worst)
+PROXY_KEY_TOLERANCE = 12   # minimum colorkey tolerance when playing a proxy (JPEG noise)
+
+
+def proxy_path(source_sha1, size, cache_dir=None):
+    """Where the proxy of a source (by content hash) at size (w, h) lives."""
+    key = hashlib.sha1(f"{source_sha1}:{size[0]}x{size[1]}:v{PROXY_VERSION}:q{PROXY_QUALITY}".encode()).hexdigest()
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, "proxies", f"{key[:20]}_{size[0]}x{size[1]}.avi")
+
+
+def make_proxy(source, dest, size, ffmpeg_bin="ffmpeg"):
+    """Transcode source to an intra-only MJPEG file of exactly size. Returns True on success."""
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = dest + ".part.avi"
+    command = [
+        ffmpeg_bin, "-y", "-loglevel", "error",
+        "-i", source,
+        "-vf", f"scale={size[0]}:{size[1]}:flags=area",
+        "-an",
+        "-c:v", "mjpeg", "-q:v", str(PROXY_QUALITY), "-pix_fmt", "yuvj420p",
+        tmp
+    ]
+    try:
+        ret = subprocess.run(command).returncode
+    except OSError as e:
+        print(f"[WARN] Cannot run {ffmpeg_bin} to build proxies: {e}")
+        return False
+    if ret != 0:
+        print(f"[WARN] Proxy transcode failed ({ret}) for {source}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+    os.replace(tmp, dest)   # never leave a half-written proxy under the final name
+    return True
+
+
+def get_proxy(source, size, cache_dir=None, source_sha1=None, ffmpeg_bin="ffmpeg"):
+    """
+    Path of the proxy for source at size, building it on first use.
+    Falls back to source itself when the proxy can't be made.
+    source_sha1: content hash if already known (the compiled timeline stores one per asset).
+    """
+    if not os.path.exists(source):
+        return source
+    if source_sha1 is None:
+        from utils.schedule_compiler import file_sha1
+        source_sha1 = file_sha1(source)
+    size = (int(size[0]), int(size[1]))
+    dest = proxy_path(source_sha1, size, cache_dir)
+    if os.path.exists(dest):
+        return dest
+
+    print(f"[INFO] Building {size[0]}x{size[1]} proxy for {source}")
+    if make_proxy(source, dest, size, ffmpeg_bin):
+        return dest
+    return source
+
+
+def video_target_size(params, panel_size=(800, 600)):
+    """Size VideoPlayer scales a centered_video to: scale * the panel it plays on."""
+    scale = params.get("scale", 0.5)
+    return (int(panel_size[0] * scale), int(panel_size[1] * scale))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build preview proxies for the videos of a schedule.")
+    parser.add_argument("schedule", help="event_schedule JSON file")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="where proxies are kept")
+    args = parser.parse_args(argv)
+
+    from utils.schedule_compiler import load_compiled_schedule
+    _, timeline = load_compiled_schedule(args.schedule, args.cache_dir)
+    built = 0
+    for ev in timeline:
+        if ev.type == "centered_video":
+            path = ev.params["video_path"]
+            sha1 = timeline.assets.get(path, {}).get("sha1")
+            built += get_proxy(path, video_target_size(ev.params), args.cache_dir, sha1) != path
+    print(f"[INFO] {built} proxies ready")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, BASE_DIR)
+    sys.exit(main())
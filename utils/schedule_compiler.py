@@ -0,0 +1,324 @@
+# utils/schedule_compiler.py
+"""
+Compile an event_schedule JSON into a validated, cached timeline artifact.
+
+Compiling validates every event against EVENT_SCHEMA, normalizes its time
+fields into one [start, end) interval (see utils.timeline.compile_event),
+resolves asset paths to absolute paths and stats and hashes every asset.
+Invalid events and events with missing assets are reported once and dropped,
+instead of being discovered mid-render.
+
+The result is cached as JSON in cache_dir. It is reused as long as the
+schedule's content hash and every asset's content hash are unchanged (assets
+whose size and mtime still match are not re-hashed), and none of the assets
+that were missing has appeared since.
+
+Usage (from the project root):
+    python -m utils.schedule_compiler media/event_schedule.json     # validate and compile
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+from utils.timeline import Timeline, TimelineEvent, compile_event
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, "cache")
+ARTIFACT_VERSION = 2
+
+# Field kinds: number (int/float), number? (number or null), path (asset file),
+# color ([r, g, b] or null), bool, dict, key_mode ("rgb" / "chroma").
+# Dotted keys address nested params.
+_BACKGROUND = {"optional": {"start_time": "number", "params.duration": "number"}}
+_TRANSITION = {"optional": {"time": "number", "start_time": "number", "params.duration": "number",
+                            "params.swirl_strength": "number", "params.quality": "number"}}
+EVENT_SCHEMA = {
+    "circular_pulsing_net": _BACKGROUND,
+    "psychedelic_background": _BACKGROUND,
+    "run_wavy_checker": _BACKGROUND,
+    "spin_fade": _TRANSITION,
+    "swirl_effect": _TRANSITION,
+    "full_image": {
+        "required": {"params.image_path": "path"},
+        "optional": {"time": "number", "start_time": "number", "params.duration": "number",
+                     "params.start_time": "number", "params.end_time": "number",
+                     "params.x": "number?", "params.y": "number?", "params.scale": "number"},
+    },
+    "two_side_images": {
+        "required": {"params.segment": "dict", "params.segment.image_left": "path",
+                     "params.segment.image_right": "path", "params.segment.start": "number",
+                     "params.segment.end": "number"},
+        "optional": {"time": "number", "start_time": "number", "params.duration": "number",
+                     "params.segment.image_left_scale": "number",
+                     "params.segment.image_right_scale": "number",
+                     "params.segment.image_slide_in": "bool",
+                     "params.segment.image_slide_in_delay": "number",
+                     "params.segment.image_slide_in_duration": "number"},
+    },
+    "tv_countdown": {"optional": {"start_time": "number", "params.duration": "number"}},
+    "embers": {"optional": {"start_time": "number", "params.duration": "number", "params.count": "number",
+                            "params.seed": "number", "params.high_start_chance": "number"}},
+    "glitch": {"optional": {"time": "number", "start_time": "number", "params.duration": "number",
+                            "params.intensity": "number", "params.seed": "number"}},
+    "arrow_overlay": {
+        "required": {"params.arrow_image_path": "path"},
+        "optional": {"params.start_time": "number", "params.end_time": "number",
+                     "params.x": "number", "params.y": "number",
+                     "params.rotation": "number", "params.scale": "number"},
+    },
+    "centered_video": {
+        "required": {"params.video_path": "path"},
+        "optional": {"params.start_time": "number", "params.end_time": "number",
+                     "params.scale": "number", "params.colorkey": "color", "params.loop": "bool",
+                     "params.key_tolerance": "number", "params.key_softness": "number",
+                     "params.key_mode": "key_mode"},
+    },
+}
+
+
+def _lookup(event, dotted):
+    """Value at a dotted key ("params.segment.start"), or KeyError."""
+    value = event
+    for part in dotted.split("."):
+        if not isinstance(value, dict) or part not in value:
+            raise KeyError(dotted)
+        value = value[part]
+    return value
+
+
+def _assign(event, dotted, value):
+    *parents, last = dotted.split(".")
+    for part in parents:
+        event = event[part]
+    event[last] = value
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_kind(value, kind):
+    if kind == "number":
+        return _is_number(value)
+    if kind == "number?":
+        return value is None or _is_number(value)
+    if kind == "path":
+        return isinstance(value, str) and value != ""
+    if kind == "color":
+        return value is None or (isinstance(value, (list, tuple)) and len(value) in (3, 4)
+                                 and all(_is_number(c) and 0 <= c <= 255 for c in value))
+    if kind == "bool":
+        return isinstance(value, bool)
+    if kind == "dict":
+        return isinstance(value, dict)
+    if kind == "key_mode":
+        return value in ("rgb", "chroma")
+    return True
+
+
+def validate_event(index, event):
+    """Schema problems of one raw event, as readable strings (empty if valid)."""
+    if not isinstance(event, dict):
+        return [f"event {index}: not an object"]
+    ev_type = event.get("event")
+    if ev_type is None:
+        return []   # markers such as {"type": "text", "action": "start"}
+    schema = EVENT_SCHEMA.get(ev_type)
+    if schema is None:
+        return [f"event {index}: unknown event type '{ev_type}' (not rendered)"]
+
+    problems = []
+    for key, kind in schema.get("required", {}).items():
+        try:
+            value = _lookup(event, key)
+        except KeyError:
+            problems.append(f"event {index} ({ev_type}): missing '{key}'")
+            continue
+        if not _check_kind(value, kind):
+            problems.append(f"event {index} ({ev_type}): '{key}' should be a {kind}, got {value!r}")
+    for key, kind in schema.get("optional", {}).items():
+        try:
+            value = _lookup(event, key)
+        except KeyError:
+            continue
+        if not _check_kind(value, kind):
+            problems.append(f"event {index} ({ev_type}): '{key}' should be a {kind}, got {value!r}")
+    return problems
+
+
+def resolve_asset_path(path, schedule_dir):
+    """Absolute path of an asset: as given, else relative to the project root, else to the schedule."""
+    if os.path.isabs(path):
+        return path
+    for root in (BASE_DIR, schedule_dir):
+        candidate = os.path.normpath(os.path.join(root, path))
+        if os.path.exists(candidate):
+            return candidate
+    return os.path.normpath(os.path.join(BASE_DIR, path))
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def asset_info(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": file_sha1(path)}
+
+
+def asset_unchanged(path, info):
+    """True if the asset at path still has the content recorded in info."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size == info["size"] and st.st_mtime_ns == info["mtime_ns"]:
+        return True
+    # Touched or copied: only a content change invalidates
+    if st.st_size != info["size"] or file_sha1(path) != info["sha1"]:
+        return False
+    info["mtime_ns"] = st.st_mtime_ns
+    return True
+
+
+def compile_schedule(events_file, raw_events=None):
+    """
+    Validate and compile a schedule file. Returns the artifact dict:
+    {"events": [...], "assets": {path: info}, "missing": [path as written], "problems": [...]}.
+    """
+    if raw_events is None:
+        with open(events_file, "r", encoding="utf-8-sig") as f:
+            raw_events = json.load(f).get("events", [])
+    schedule_dir = os.path.dirname(os.path.abspath(events_file))
+
+    events, assets, missing_assets, problems = [], {}, [], []
+    for index, raw in enumerate(raw_events):
+        errors = validate_event(index, raw)
+        if errors:
+            problems.extend(errors)
+            continue
+        ev_type = raw.get("event")
+        if ev_type is None:
+            continue
+
+        # Resolve every path field on a copy of the event
+        event = json.loads(json.dumps(raw))
+        missing = False
+        for key, kind in EVENT_SCHEMA[ev_type].get("required", {}).items():
+            if kind != "path":
+                continue
+            raw_path = _lookup(event, key)
+            path = resolve_asset_path(raw_path, schedule_dir)
+            if not os.path.exists(path):
+                problems.append(f"event {index} ({ev_type}): asset not found: {path}")
+                if raw_path not in missing_assets:
+                    missing_assets.append(raw_path)
+                missing = True
+                continue
+            _assign(event, key, path)
+            if path not in assets:
+                assets[path] = asset_info(path)
+        if missing:
+            continue
+
+        compiled = compile_event(index, event)
+        if compiled is None or compiled.end <= compiled.start:
+            continue
+        events.append({"index": compiled.index, "type": compiled.type, "layer": compiled.layer,
+                       "start": compiled.start, "end": compiled.end, "params": compiled.params})
+    return {"events": events, "assets": assets, "missing": missing_assets, "problems": problems}
+
+
+def artifact_path(events_file, cache_dir=None):
+    key = hashlib.sha1(os.path.abspath(events_file).encode("utf-8")).hexdigest()[:12]
+    name = os.path.splitext(os.path.basename(events_file))[0].replace(" ", "_")
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, "timeline", f"{name}-{key}.json")
+
+
+def _load_artifact(path, schedule_hash):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if artifact.get("version") != ARTIFACT_VERSION or artifact.get("schedule_sha1") != schedule_hash:
+        return None
+    schedule_dir = os.path.dirname(artifact.get("schedule_path", ""))
+    if any(os.path.exists(resolve_asset_path(asset, schedule_dir)) for asset in artifact.get("missing", [])):
+        return None   # a dropped event's asset is there now: compile it in
+    assets = artifact.get("assets", {})
+    mtimes = [info["mtime_ns"] for info in assets.values()]
+    if not all(asset_unchanged(asset, info) for asset, info in assets.items()):
+        return None
+    if mtimes != [info["mtime_ns"] for info in assets.values()]:
+        _write_artifact(path, artifact)   # same content, new mtimes: skip re-hashing next time
+    return artifact
+
+
+def _write_artifact(path, artifact):
+    # Parallel render workers load the same schedule at once: write under a
+    # per-process name and swap it in, so nobody reads a half-written artifact
+    tmp = f"{path}.{os.getpid()}.part"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARN] Could not write timeline cache {path}: {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_compiled_schedule(events_file, cache_dir=None):
+    """
+    Load events_file as (raw_events, Timeline), compiling it only when the cached
+    artifact is missing or stale. timeline.assets maps asset paths to size/mtime/sha1.
+    """
+    with open(events_file, "rb") as f:
+        data = f.read()
+    schedule_hash = hashlib.sha1(data).hexdigest()
+    raw_events = json.loads(data.decode("utf-8-sig")).get("events", [])
+
+    path = artifact_path(events_file, cache_dir)
+    artifact = _load_artifact(path, schedule_hash)
+    if artifact is None:
+        artifact = compile_schedule(events_file, raw_events)
+        artifact.update(version=ARTIFACT_VERSION, schedule_path=os.path.abspath(events_file),
+                        schedule_sha1=schedule_hash)
+        _write_artifact(path, artifact)
+        print(f"[INFO] Compiled {len(artifact['events'])} events from {events_file}")
+
+    for problem in artifact["problems"]:
+        print(f"[WARN] Schedule: {problem}")
+
+    events = [TimelineEvent(e["index"], e["type"], e["layer"], e["start"], e["end"],
+                            e["params"], raw_events[e["index"]])
+              for e in artifact["events"]]
+    timeline = Timeline.from_events(events)
+    timeline.assets = artifact["assets"]
+    timeline.problems = artifact["problems"]
+    return raw_events, timeline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate and compile an event schedule.")
+    parser.add_argument("schedule", help="event_schedule JSON file")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="where compiled timelines are kept")
+    args = parser.parse_args(argv)
+
+    _, timeline = load_compiled_schedule(args.schedule, args.cache_dir)
+    print(f"[INFO] {len(timeline)} events, {len(timeline.assets)} assets, "
+          f"{len(timeline.problems)} problems")
+    return 1 if timeline.problems else 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, BASE_DIR)
+    sys.exit(main())
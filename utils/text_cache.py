@@ -0,0 +1,103 @@
+# utils/text_cache.py
+"""
+Cached text rendering for captions and on-screen counters.
+
+TextCache keeps rendered strings keyed by (font, text, color) in a bounded
+LRU, so captions that stay on screen for seconds are rendered once.
+GlyphAtlas pre-renders single characters (digits and punctuation) so strings
+that change every frame, like the elapsed-time counter, are assembled from
+cached glyph blits instead of a fresh font.render.
+"""
+from collections import OrderedDict
+import pygame
+from utils.asset_cache import surface_nbytes
+
+DEFAULT_TEXT_BUDGET_BYTES = 32 * 1024 * 1024
+
+
+class TextCache:
+    """
+    Bounded LRU of rendered text surfaces. The font object carries its size,
+    so the key is effectively (font, size, text, color).
+
+    Example usage:
+        text_surface = text_cache.render(font, "Hello", (255, 255, 255))
+    """
+    def __init__(self, max_bytes=DEFAULT_TEXT_BUDGET_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Same as font.render(text, antialias, color), but cached."""
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        self.total_bytes += surface_nbytes(surface)
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.total_bytes -= surface_nbytes(old)
+        return surface
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self.entries), "bytes": self.total_bytes}
+
+
+class GlyphAtlas:
+    """
+    Pre-rendered glyphs of one font and color, placed by their advance width.
+
+    Example usage:
+        digits = GlyphAtlas(font, (255, 255, 255))
+        digits.blit(screen, f"{elapsed:06.3f}s", (10, 10))
+    """
+    def __init__(self, font, color, chars="0123456789.:-s "):
+        self.font = font
+        self.color = tuple(color)
+        self.height = font.get_height()
+        self.glyphs = {}
+        for ch in chars:
+            self._add(ch)
+
+    def _add(self, ch):
+        metrics = self.font.metrics(ch)
+        advance = metrics[0][4] if metrics and metrics[0] else self.font.size(ch)[0]
+        glyph = self.font.render(ch, True, self.color)
+        self.glyphs[ch] = (glyph, advance)
+        return self.glyphs[ch]
+
+    def width(self, text):
+        return sum((self.glyphs.get(ch) or self._add(ch))[1] for ch in text)
+
+    def blit(self, surface, text, pos):
+        """Draw text at pos from cached glyphs. Returns the bounding Rect."""
+        x, y = pos
+        for ch in text:
+            glyph, advance = self.glyphs.get(ch) or self._add(ch)
+            surface.blit(glyph, (x, y))
+            x += advance
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
+
+
+# Shared cache used by run_visuals and its overlays
+text_cache = TextCache()
+_atlases = {}
+
+
+def get_glyph_atlas(font, color):
+    """Shared GlyphAtlas for a font and color (built on first use)."""
+    key = (font, tuple(color))
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(font, color)
+    return atlas
@@ -0,0 +1,179 @@
+# utils/timeline.py
+"""
+Compiled event schedule: every event is parsed once into a TimelineEvent with
+float start/end times, and an interval index answers "which events are active
+at t" with a binary search instead of a scan over the whole schedule.
+"""
+from bisect import bisect_left, bisect_right
+
+# Event types by layer, in draw order
+BACKGROUND_EVENTS = ("circular_pulsing_net", "psychedelic_background", "run_wavy_checker")
+MIDDLE_EVENTS = ("spin_fade", "swirl_effect", "two_side_images", "full_image")
+OVERLAY_EVENTS = ("tv_countdown", "arrow_overlay", "centered_video", "embers", "glitch")
+TRANSITION_EVENTS = ("spin_fade", "swirl_effect")
+
+LAYER_BACKGROUND = 0
+LAYER_MIDDLE = 1
+LAYER_OVERLAY = 2
+
+INF = float("inf")
+
+
+def _float(value, default):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class TimelineEvent:
+    """One schedule event with its active interval [start, end) resolved to floats."""
+    __slots__ = ("index", "type", "layer", "start", "end", "params", "raw")
+
+    def __init__(self, index, ev_type, layer, start, end, params, raw):
+        self.index = index
+        self.type = ev_type
+        self.layer = layer
+        self.start = start
+        self.end = end
+        self.params = params
+        self.raw = raw
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def __repr__(self):
+        return f"TimelineEvent({self.index}, {self.type!r}, {self.start:.3f}-{self.end:.3f})"
+
+
+def compile_event(index, event):
+    """
+    Resolve the active interval of a raw schedule event the same way run_visuals
+    always has. Returns None for events that draw nothing (markers, unknown types).
+    """
+    ev_type = event.get("event")
+    params = event.get("params", {}) or {}
+
+    if ev_type in BACKGROUND_EVENTS:
+        start = _float(event.get("start_time", 0), 0.0)
+        end = start + _float(params.get("duration", 9999), 9999.0)
+        return TimelineEvent(index, ev_type, LAYER_BACKGROUND, start, end, params, event)
+
+    if ev_type in MIDDLE_EVENTS:
+        start = _float(event.get("start_time", event.get("time", 0)), 0.0)
+        # Transitions last exactly their own duration (2 s unless given)
+        default_duration = 2.0 if ev_type in TRANSITION_EVENTS else 5.0
+        end = start + _float(params.get("duration", default_duration), default_duration)
+        if ev_type == "full_image":
+            # render_full_image only draws inside its own params window
+            start = max(start, _float(params.get("start_time", 0), 0.0))
+            end = min(end, _float(params.get("end_time", 9999), 9999.0))
+        return TimelineEvent(index, ev_type, LAYER_MIDDLE, start, end, params, event)
+
+    if ev_type == "tv_countdown":
+        start = _float(event.get("start_time", 0), 0.0)
+        end = start + _float(params.get("duration", 5), 5.0)
+        return TimelineEvent(index, ev_type, LAYER_OVERLAY, start, end, params, event)
+
+    if ev_type == "embers":
+        start = _float(event.get("start_time", 0), 0.0)
+        end = start + _float(params.get("duration", 9999), 9999.0)
+        return TimelineEvent(index, ev_type, LAYER_OVERLAY, start, end, params, event)
+
+    if ev_type == "glitch":
+        start = _float(event.get("start_time", event.get("time", 0)), 0.0)
+        end = start + _float(params.get("duration", 1.0), 1.0)
+        return TimelineEvent(index, ev_type, LAYER_OVERLAY, start, end, params, event)
+
+    if ev_type in ("arrow_overlay", "centered_video"):
+        start = _float(params.get("start_time", 0), 0.0)
+        end = _float(params.get("end_time", INF), INF)
+        return TimelineEvent(index, ev_type, LAYER_OVERLAY, start, end, params, event)
+
+    return None
+
+
+class IntervalIndex:
+    """
+    Stabbing-query index over [start, end) intervals.
+
+    The timeline is cut at every start/end boundary; each elementary segment
+    stores the (already draw-ordered) tuple of events covering it. A query is
+    one bisect, so per-frame cost depends on the active events only.
+    """
+    def __init__(self, events):
+        bounds = sorted({e.start for e in events} | {e.end for e in events})
+        by_start = sorted(events, key=lambda e: e.start)
+        draw_order = lambda e: (e.layer, e.index)
+
+        # Sweep the boundaries once, carrying the set of open intervals along
+        self.bounds = bounds
+        self.segments = []
+        active = []
+        j = 0
+        for lo in bounds:
+            while j < len(by_start) and by_start[j].start <= lo:
+                active.append(by_start[j])
+                j += 1
+            active = [e for e in active if e.end > lo]
+            self.segments.append(tuple(sorted(active, key=draw_order)))
+
+    def query(self, t):
+        i = bisect_right(self.bounds, t) - 1
+        if i < 0:
+            return ()
+        return self.segments[i]
+
+    def next_change(self, t):
+        """Time of the next boundary after t (INF if nothing else happens)."""
+        i = bisect_right(self.bounds, t)
+        return self.bounds[i] if i < len(self.bounds) else INF
+
+    def prev_change(self, t):
+        """Time of the last boundary before t (0.0 if there is none)."""
+        i = bisect_left(self.bounds, t) - 1
+        return self.bounds[i] if i >= 0 else 0.0
+
+
+class Timeline:
+    """
+    Sorted, typed view of an event schedule.
+
+    Example usage:
+        timeline = Timeline(event_schedule)
+        for ev in timeline.active(current_time):
+            ...
+    """
+    def __init__(self, event_schedule):
+        compiled = (compile_event(i, e) for i, e in enumerate(event_schedule))
+        self._set_events(e for e in compiled if e is not None and e.end > e.start)
+
+    @classmethod
+    def from_events(cls, events):
+        """Timeline over already compiled TimelineEvents (see utils.schedule_compiler)."""
+        timeline = cls.__new__(cls)
+        timeline._set_events(events)
+        return timeline
+
+    def _set_events(self, events):
+        self.events = sorted(events, key=lambda e: (e.layer, e.index))
+        self.index = IntervalIndex(self.events)
+        self.assets = {}     # asset path -> size/mtime/sha1, filled in by the compiler
+        self.problems = []
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def active(self, t):
+        """Events active at time t, in draw order (backgrounds, middle, overlays)."""
+        return self.index.query(t)
+
+    def next_change(self, t):
+        return self.index.next_change(t)
+
+    def prev_change(self, t):
+        return self.index.prev_change(t)
@@ -1,5 +1,202 @@
 import pygame
 import math
+import cv2
+import numpy as np
+
+SWIRL_MAX_PIXELS = 1000000   # default swirl grid budget: full resolution up to ~1 MP, coarser above
+
+# ----------------------------
+# Frame helpers
+# ----------------------------
+def spin_fade_frame(surface, screen, progress):
+    """Draw one Spin & Fade frame of surface onto screen (progress 0..1)."""
+    angle = progress * 360
+    alpha = 255 * (1 - progress)
+    center = (screen.get_width() // 2, screen.get_height() // 2)
+
+    rotated = pygame.transform.rotate(surface, angle)
+    rotated.set_alpha(int(alpha))
+    rect = rotated.get_rect(center=center)
+
+    screen.fill((0, 0, 0))
+    screen.blit(rotated, rect.topleft)
+
+
+class SwirlGrid:
+    """
+    Polar coordinates of a sampling grid over a surface size, computed once.
+
+    A pixel at angle theta and distance d from the center samples the source at
+    angle theta + phi(d), with phi(d) = swirl_angle * d / max(cx, cy). Per frame
+    that is one multiply-add for the angles and one cv2.polarToCart for the
+    source coordinates; cv2.remap then does the gather.
+
+    quality < 1.0 builds a coarser grid (quality * size samples per axis) that
+    still samples the full-resolution source; the result is scaled back up.
+    """
+    def __init__(self, size, center=None, quality=1.0):
+        width, height = size
+        if center is None:
+            center = (width // 2, height // 2)
+        self.size = size
+        self.center = center
+        self.norm = max(center[0], center[1], 1)
+        self.grid_size = (max(1, int(width * quality)), max(1, int(height * quality)))
+        grid_w, grid_h = self.grid_size
+
+        # Row-major (height, width) layout, as cv2 expects its maps
+        xs = np.arange(grid_w, dtype=np.float32) * np.float32(width / grid_w) - center[0]
+        ys = np.arange(grid_h, dtype=np.float32) * np.float32(height / grid_h) - center[1]
+        dx = np.broadcast_to(xs[None, :], (grid_h, grid_w))
+        dy = np.broadcast_to(ys[:, None], (grid_h, grid_w))
+        self.dist = np.ascontiguousarray(np.hypot(dx, dy))
+        self.theta = np.ascontiguousarray(np.arctan2(dy, dx))
+
+        # Scratch buffers reused every frame (no per-frame allocation of grid-sized arrays)
+        self._angle = np.empty_like(self.dist)
+        self._map_x = np.empty_like(self.dist)
+        self._map_y = np.empty_like(self.dist)
+        self.out = np.empty((grid_h, grid_w, 4), dtype=np.uint8)
+
+    def source_maps(self, swirl_angle):
+        """cv2.remap maps (source x, y per grid cell) for one swirl angle."""
+        angle = np.multiply(self.dist, np.float32(swirl_angle / self.norm), out=self._angle)
+        angle += self.theta
+        map_x, map_y = cv2.polarToCart(self.dist, angle, x=self._map_x, y=self._map_y)
+        # cv2 rounds to the nearest pixel; -0.5 truncates like the per-pixel original
+        map_x += np.float32(self.center[0] - 0.5)
+        map_y += np.float32(self.center[1] - 0.5)
+        return map_x, map_y
+
+
+_swirl_grids = {}
+
+
+def get_swirl_grid(size, center=None, quality=1.0):
+    """Shared SwirlGrid for a surface size, center and quality (built on first use)."""
+    key = (tuple(size), center, quality)
+    grid = _swirl_grids.get(key)
+    if grid is None:
+        grid = _swirl_grids[key] = SwirlGrid(size, center, quality)
+    return grid
+
+
+def auto_swirl_quality(size):
+    """Grid resolution factor that keeps a swirl frame near SWIRL_MAX_PIXELS samples."""
+    return min(1.0, math.sqrt(SWIRL_MAX_PIXELS / max(size[0] * size[1], 1)))
+
+
+def _pixel_array(surface):
+    """(h, w, 4) uint8 view of a 32-bit surface's pixels (holds the surface lock)."""
+    width, height = surface.get_size()
+    return pygame.surfarray.pixels2d(surface).T.view(np.uint8).reshape(height, width, 4)
+
+
+def swirl_pixels(surface, progress, swirl_strength=5, center=None, quality=1.0):
+    """
+    Swirled pixels of a 32-bit surface as a (grid_h, grid_w, 4) uint8 array in the
+    surface's byte order. The array is the grid's reused buffer: copy it to keep it.
+    """
+    grid = get_swirl_grid(surface.get_size(), center, quality)
+    map_x, map_y = grid.source_maps(swirl_strength * progress * math.pi * 2)
+    black = surface.map_rgb((0, 0, 0)) & 0xFFFFFFFF
+    src = _pixel_array(surface)
+    cv2.remap(src, map_x, map_y, cv2.INTER_NEAREST, dst=grid.out,
+              borderMode=cv2.BORDER_CONSTANT, borderValue=tuple((black >> s) & 0xFF for s in (0, 8, 16, 24)))
+    del src
+    return grid.out
+
+
+def swirl_into(surface, dest, progress, swirl_strength=5, center=None, quality=None):
+    """
+    Write the swirl of surface into dest (same size and format, may be the same surface).
+    quality None picks one from the surface size (auto_swirl_quality).
+    """
+    if quality is None:
+        quality = auto_swirl_quality(surface.get_size())
+    out = swirl_pixels(surface, progress, swirl_strength, center, quality)
+    if quality >= 1.0:
+        pixels = _pixel_array(dest)
+        pixels[...] = out
+        del pixels
+        return
+
+    grid_h, grid_w = out.shape[:2]
+    small = pygame.Surface((grid_w, grid_h), 0, surface)
+    pixels = _pixel_array(small)
+    pixels[...] = out
+    del pixels
+    pygame.transform.scale(small, dest.get_size(), dest)
+
+
+def swirl_surface(surface, progress, swirl_strength=5, center=None, quality=None):
+    """Return a swirled copy of surface (progress 0..1)."""
+    if surface.get_bytesize() != 4:
+        surface = surface.convert(32)
+    distorted = pygame.Surface(surface.get_size(), 0, surface)
+    swirl_into(surface, distorted, progress, swirl_strength, center, quality)
+    return distorted
+
+
+# ----------------------------
+# Frame-driven transitions (for use inside run_visuals)
+# ----------------------------
+class SpinFade:
+    """
+    Spins and fades out whatever has been drawn on screen so far this frame.
+
+    Call update(current_time) once per frame after the layers it should
+    transition; it draws a single frame and returns, like TVCountdownWithBurst.
+    """
+    def __init__(self, screen, start_time=0.0, duration=2.0):
+        self.screen = screen
+        self.start_time = start_time
+        self.duration = duration
+        self.done = False
+
+    def update(self, current_time):
+        """Draw the transition frame for current_time (seconds)."""
+        elapsed = current_time - self.start_time
+        if elapsed < 0 or self.done:
+            return
+        if elapsed > self.duration:
+            self.done = True
+            return
+        spin_fade_frame(self.screen, self.screen, elapsed / self.duration)
+
+
+class SwirlEffect:
+    """
+    Swirls whatever has been drawn on screen so far this frame.
+
+    Call update(current_time) once per frame after the layers it should transition.
+    quality: resolution factor of the remap (1.0 = every pixel, 0.5 = quarter the work);
+    None picks it from the screen size (auto_swirl_quality).
+    """
+    def __init__(self, screen, start_time=0.0, duration=2.0, swirl_strength=5, quality=None):
+        self.screen = screen
+        self.start_time = start_time
+        self.duration = duration
+        self.swirl_strength = swirl_strength
+        self.quality = quality
+        self.done = False
+
+    def update(self, current_time):
+        """Draw the transition frame for current_time (seconds)."""
+        elapsed = current_time - self.start_time
+        if elapsed < 0 or self.done:
+            return
+        if elapsed > self.duration:
+            self.done = True
+            return
+        progress = elapsed / self.duration
+        if self.screen.get_bytesize() == 4:
+            # Gather straight from the frame into itself: no intermediate full-size surface
+            swirl_into(self.screen, self.screen, progress, self.swirl_strength, quality=self.quality)
+        else:
+            distorted = swirl_surface(self.screen, progress, self.swirl_strength, quality=self.quality)
+            self.screen.blit(distorted, (0, 0))
+
 
 # ----------------------------
 # Spin & Fade Transition
@@ -7,28 +204,17 @@ import math
 def spin_fade(surface, screen, duration=2000):
     """
     Spins and fades out the given surface over a duration (in ms).
+    Blocking: owns the display until the transition ends. Inside run_visuals use SpinFade.
     """
     clock = pygame.time.Clock()
     start_time = pygame.time.get_ticks()
 
-    width, height = surface.get_size()
-    center = (screen.get_width() // 2, screen.get_height() // 2)
-
     while True:
         elapsed = pygame.time.get_ticks() - start_time
         if elapsed > duration:
             break
 
-        progress = elapsed / duration
-        angle = progress * 360
-        alpha = 255 * (1 - progress)
-
-        rotated = pygame.transform.rotate(surface, angle)
-        rotated.set_alpha(int(alpha))
-        rect = rotated.get_rect(center=center)
-
-        screen.fill((0, 0, 0))
-        screen.blit(rotated, rect.topleft)
+        spin_fade_frame(surface, screen, elapsed / duration)
         pygame.display.flip()
         clock.tick(60)
 
@@ -39,35 +225,18 @@ def spin_fade(surface, screen, duration=2000):
 def swirl_effect(surface, screen, duration=2000, swirl_strength=5):
     """
     Applies a swirl effect transition on the given surface.
+    Blocking: owns the display until the transition ends. Inside run_visuals use SwirlEffect.
     """
     clock = pygame.time.Clock()
     start_time = pygame.time.get_ticks()
-    center_x, center_y = screen.get_width() // 2, screen.get_height() // 2
+    center = (screen.get_width() // 2, screen.get_height() // 2)
 
     while True:
         elapsed = pygame.time.get_ticks() - start_time
         if elapsed > duration:
             break
 
-        progress = elapsed / duration
-        swirl_angle = swirl_strength * progress * math.pi * 2
-
-        distorted = pygame.Surface(surface.get_size())
-        distorted.fill((0, 0, 0))
-
-        for y in range(surface.get_height()):
-            for x in range(surface.get_width()):
-                dx = x - center_x
-                dy = y - center_y
-                distance = math.hypot(dx, dy)
-                angle = math.atan2(dy, dx) + swirl_angle * (distance / max(center_x, center_y))
-
-                src_x = int(center_x + distance * math.cos(angle))
-                src_y = int(center_y + distance * math.sin(angle))
-
-                if 0 <= src_x < surface.get_width() and 0 <= src_y < surface.get_height():
-                    distorted.set_at((x, y), surface.get_at((src_x, src_y)))
-
+        distorted = swirl_surface(surface, elapsed / duration, swirl_strength, center)
         screen.blit(distorted, (0, 0))
         pygame.display.flip()
         clock.tick(60)
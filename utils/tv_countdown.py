@@ -16,6 +16,7 @@ class TVCountdownWithBurst:
                  font_size=200, font_color=(255, 255, 255), bg_color=(0, 0, 0), start_time=0.0):
         self.screen = screen
         self.screen_width, self.screen_height = screen.get_size()
+        self.countdown_start = countdown_start
         self.countdown = countdown_start
         self.countdown_duration = countdown_duration
         self.burst_duration = burst_duration
@@ -34,7 +35,11 @@ class TVCountdownWithBurst:
         self.internal_elapsed = 0.0  # elapsed relative to countdown start
 
     def update(self, current_time):
-        """Update countdown based on current_time from run_visuals."""
+        """
+        Update countdown based on current_time from run_visuals.
+        The frame drawn depends only on current_time, so rendering can start
+        (or seek) anywhere inside the countdown.
+        """
         if self.done:
             return
 
@@ -42,7 +47,9 @@ class TVCountdownWithBurst:
         if elapsed < 0:
             return  # not started yet
 
-        self.internal_elapsed = elapsed
+        count_time = self.countdown_start * self.countdown_duration
+        self.countdown = max(self.countdown_start - int(elapsed // self.countdown_duration), 0)
+        self.internal_elapsed = elapsed % self.countdown_duration if self.countdown > 0 else 0.0
 
         self.screen.fill(self.bg_color)
 
@@ -51,14 +58,9 @@ class TVCountdownWithBurst:
             rect = text_surface.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
             self.screen.blit(text_surface, rect)
 
-            if self.internal_elapsed >= self.countdown_duration:
-                self.countdown -= 1
-                self.start_time += self.countdown_duration
-                self.internal_elapsed = 0.0
-
         elif self.countdown == 0:
             if self.burst_start_time is None:
-                self.burst_start_time = current_time
+                self.burst_start_time = self.start_time + count_time
 
             burst_elapsed = current_time - self.burst_start_time
             progress = min(burst_elapsed / self.burst_duration, 1.0)
@@ -1,5 +1,83 @@
+from collections import OrderedDict
 import pygame
 from pygame import Surface
+from utils.asset_cache import load_surface, surface_nbytes
+
+ZOOM_STEPS = 32                          # quantized zoom levels between 1.0 and MAX_ZOOM
+DEFAULT_ZOOM_BUDGET_BYTES = 96 * 1024 * 1024
+
+
+class ZoomCache:
+    """
+    Byte-budget LRU of zoomed copies of images, keyed by (image, quantized level,
+    placement). A zoom phase runs through the same few dozen sizes every time, so
+    each is smoothscaled once instead of every frame. Only the part of a zoomed
+    image that lands inside the clip rect is kept: a 2.5x zoom of a large picture
+    is mostly off screen.
+
+    Example usage:
+        zoomed, rect = zoom_cache.get(image, 1.73, 2.5, "bottomleft", (390, 420), screen.get_rect())
+        screen.blit(zoomed, rect)
+    """
+    def __init__(self, max_bytes=DEFAULT_ZOOM_BUDGET_BYTES, steps=ZOOM_STEPS):
+        self.max_bytes = max_bytes
+        self.steps = steps
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def level(self, factor, max_zoom):
+        """Nearest quantized level (0 = unzoomed, steps = max_zoom) for a zoom factor."""
+        if max_zoom <= 1.0:
+            return 0
+        return min(max(round((factor - 1.0) / (max_zoom - 1.0) * self.steps), 0), self.steps)
+
+    def get(self, image, factor, max_zoom, anchor, pos, clip):
+        """
+        image zoomed by factor (snapped to the nearest cached level) and placed with
+        its anchor point ("bottomleft", "midright", ...) at pos, cropped to clip.
+        Returns (surface, rect) ready to blit.
+        """
+        level = self.level(factor, max_zoom)
+        if level == 0:
+            return image, image.get_rect(**{anchor: pos})
+        key = (image, max_zoom, level, anchor, tuple(pos), tuple(clip))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        factor = 1.0 + (max_zoom - 1.0) * level / self.steps
+        zoomed = pygame.transform.smoothscale(
+            image, (int(image.get_width() * factor), int(image.get_height() * factor)))
+        rect = zoomed.get_rect(**{anchor: pos})
+        visible = rect.clip(clip)
+        # copy() so the full-size zoom is freed; an empty crop stays a 0x0 surface
+        surface = zoomed.subsurface(visible.move(-rect.x, -rect.y)).copy()
+        entry = self.entries[key] = (surface, visible)
+        self.total_bytes += surface_nbytes(surface)
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (old, _) = self.entries.popitem(last=False)
+            self.total_bytes -= surface_nbytes(old)
+        return entry
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self.entries), "bytes": self.total_bytes}
+
+
+# Shared by all animators: images come from the shared asset cache, so the same
+# picture in several segments reuses its zoom levels
+zoom_cache = ZoomCache()
+
+
 class TwoSideImagesAnimator:
     def __init__(self, screen: Surface, segment: dict, screen_width: int, screen_height: int):
         self.screen = screen
@@ -7,23 +85,13 @@ class TwoSideImagesAnimator:
         self.WIDTH = screen_width
         self.HEIGHT = screen_height
 
-        # Load images
-        self.img_left = pygame.image.load(segment["image_left"]).convert_alpha()
-        self.img_right = pygame.image.load(segment["image_right"]).convert_alpha()
-
         # Scale factors with defaults
         scale_left = segment.get("image_left_scale", 1.0)
         scale_right = segment.get("image_right_scale", 1.0)
 
-        # Scale images
-        native_left = self.img_left.get_size()
-        native_right = self.img_right.get_size()
-
-        new_size_left = (int(native_left[0] * scale_left), int(native_left[1] * scale_left))
-        new_size_right = (int(native_right[0] * scale_right), int(native_right[1] * scale_right))
-
-        self.img_left = pygame.transform.smoothscale(self.img_left, new_size_left)
-        self.img_right = pygame.transform.smoothscale(self.img_right, new_size_right)
+        # Load scaled images through the shared asset cache
+        self.img_left = load_surface(segment["image_left"], scale=scale_left)
+        self.img_right = load_surface(segment["image_right"], scale=scale_right)
 
         # Segment time info
         self.start = segment["start"]
@@ -43,6 +111,16 @@ class TwoSideImagesAnimator:
 
         self.done = False  # <-- Added done flag
 
+    def _zoom_factor(self, zoom_time):
+        """Zoom curve of one image: ramp up, hold at MAX_ZOOM, ramp down."""
+        if zoom_time < self.ZOOM_IN_DURATION:
+            return 1.0 + (self.MAX_ZOOM - 1.0) * (zoom_time / self.ZOOM_IN_DURATION)
+        if zoom_time < self.ZOOM_IN_DURATION + self.ZOOM_HOLD_DURATION:
+            return self.MAX_ZOOM
+        return self.MAX_ZOOM - (self.MAX_ZOOM - 1.0) * (
+            (zoom_time - self.ZOOM_IN_DURATION - self.ZOOM_HOLD_DURATION) / self.ZOOM_OUT_DURATION
+        )
+
     def update(self, elapsed_time: float):
         """
         Call each frame with elapsed_time (seconds) since start of segment.
@@ -98,21 +176,10 @@ class TwoSideImagesAnimator:
                 total_zoom_phase = self.ZOOM_IN_DURATION + self.ZOOM_HOLD_DURATION + self.ZOOM_OUT_DURATION
 
                 if zoom_time < total_zoom_phase:
-                    # Zoom left image
-                    if zoom_time < self.ZOOM_IN_DURATION:
-                        factor = 1.0 + (self.MAX_ZOOM - 1.0) * (zoom_time / self.ZOOM_IN_DURATION)
-                    elif zoom_time < self.ZOOM_IN_DURATION + self.ZOOM_HOLD_DURATION:
-                        factor = self.MAX_ZOOM
-                    else:
-                        factor = self.MAX_ZOOM - (self.MAX_ZOOM - 1.0) * (
-                            (zoom_time - self.ZOOM_IN_DURATION - self.ZOOM_HOLD_DURATION) / self.ZOOM_OUT_DURATION
-                        )
-
-                    zoomed_left = pygame.transform.smoothscale(
-                        self.img_left,
-                        (int(self.img_left.get_width() * factor), int(self.img_left.get_height() * factor))
-                    )
-                    zoomed_rect = zoomed_left.get_rect(bottomleft=left_rect.bottomleft)
+                    # Zoom left image (nearest cached zoom level)
+                    factor = self._zoom_factor(zoom_time)
+                    zoomed_left, zoomed_rect = zoom_cache.get(self.img_left, factor, self.MAX_ZOOM, "bottomleft",
+                                                              left_rect.bottomleft, self.screen.get_rect())
 
                     # Draw background right, then zoomed left
                     self.screen.blit(self.img_right, right_rect)
@@ -121,21 +188,9 @@ class TwoSideImagesAnimator:
                 elif zoom_time < 2 * total_zoom_phase:
                     # Zoom right image
                     zoom_time_right = zoom_time - total_zoom_phase
-
-                    if zoom_time_right < self.ZOOM_IN_DURATION:
-                        factor = 1.0 + (self.MAX_ZOOM - 1.0) * (zoom_time_right / self.ZOOM_IN_DURATION)
-                    elif zoom_time_right < self.ZOOM_IN_DURATION + self.ZOOM_HOLD_DURATION:
-                        factor = self.MAX_ZOOM
-                    else:
-                        factor = self.MAX_ZOOM - (self.MAX_ZOOM - 1.0) * (
-                            (zoom_time_right - self.ZOOM_IN_DURATION - self.ZOOM_HOLD_DURATION) / self.ZOOM_OUT_DURATION
-                        )
-
-                    zoomed_right = pygame.transform.smoothscale(
-                        self.img_right,
-                        (int(self.img_right.get_width() * factor), int(self.img_right.get_height() * factor))
-                    )
-                    zoomed_rect = zoomed_right.get_rect(bottomright=right_rect.bottomright)
+                    factor = self._zoom_factor(zoom_time_right)
+                    zoomed_right, zoomed_rect = zoom_cache.get(self.img_right, factor, self.MAX_ZOOM, "bottomright",
+                                                               right_rect.bottomright, self.screen.get_rect())
 
                     # Draw background left, then zoomed right
                     self.screen.blit(self.img_left, left_rect)
@@ -2,7 +2,7 @@ def load_timestamps(path):
     """
     Load a timestamp file where each line is:
         <second> <text>
-    Returns a list of dicts: [{"time": int, "text": str}, ...]
+    Returns a list of dicts: [{"time": float, "text": str}, ...]
     """
     timestamps = []
     try:
@@ -16,7 +16,7 @@ def load_timestamps(path):
                     continue
                 time_str, text = parts
                 try:
-                    time_sec = int(time_str)
+                    time_sec = float(time_str)
                     timestamps.append({"time": time_sec, "text": text})
                 except ValueError:
                     continue
@@ -1,42 +1,308 @@
 import cv2
 import pygame
+import queue
+import threading
 import time
 
 # utils/video_utils.py
 import cv2
+import numpy as np
 import pygame
 
+KEY_MODES = ("rgb", "chroma")
+
+
+def key_alpha(frame, key_bgr, tolerance=0, softness=0, mode="rgb"):
+    """
+    Alpha mask (uint8, 0 = keyed out) of a BGR frame against a key color.
+
+    mode "rgb":    distance is the largest per-channel difference to the key color
+                   (tolerance 0, softness 0 = exact match only, like set_colorkey).
+    mode "chroma": distance in the CrCb plane only, so shading and brightness noise on
+                   a green/blue screen don't matter.
+    Pixels within tolerance are transparent; the next `softness` levels ramp to opaque.
+    """
+    if mode == "chroma":
+        ycc = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
+        key = cv2.cvtColor(np.uint8([[key_bgr]]), cv2.COLOR_BGR2YCrCb)[0, 0]
+        _, cr, cb = cv2.split(cv2.absdiff(ycc, (0, int(key[1]), int(key[2]), 0)))
+        dist = cv2.max(cr, cb)
+    else:
+        b, g, r = cv2.split(cv2.absdiff(frame, (int(key_bgr[0]), int(key_bgr[1]), int(key_bgr[2]), 0)))
+        dist = cv2.max(cv2.max(b, g), r)
+
+    if softness <= 0:
+        return cv2.threshold(dist, tolerance, 255, cv2.THRESH_BINARY)[1]
+    # Saturating uint8 math: (dist - tolerance) * 255 / softness, clipped to 0..255
+    return cv2.multiply(cv2.subtract(dist, tolerance), 255.0 / softness, dtype=cv2.CV_8U)
+
+
+def premultiplied_rgba(frame, alpha):
+    """(H, W, 4) RGBA with color premultiplied by alpha, from a BGR frame and its mask."""
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    rgba = np.empty(frame.shape[:2] + (4,), dtype=np.uint8)
+    rgba[..., :3] = cv2.multiply(rgb, cv2.merge((alpha, alpha, alpha)), scale=1.0 / 255)
+    rgba[..., 3] = alpha
+    return rgba
+
+
+class VideoDecoder:
+    """
+    Decodes one video on a background thread into a bounded ring of
+    ready-to-blit frames: already converted to RGB, scaled and colorkeyed.
+
+    frames holds (generation, pts_seconds, surface) tuples. pts is timeline time:
+    it keeps increasing across loops, so the consumer can select by time without
+    special cases. seek() bumps the generation; older frames are stale.
+
+    With a colorkey, the key is applied here on the decoded array (see key_alpha)
+    and frames are premultiplied RGBA surfaces: blit them with BLEND_PREMULTIPLIED.
+    """
+    SKIP_AHEAD = 1.0  # forward jumps shorter than this decode through instead of seeking
+
+    def __init__(self, video_path, size, colorkey=None, buffer_size=8, loop=True,
+                 key_tolerance=0, key_softness=0, key_mode="rgb"):
+        self.video_path = video_path
+        self.size = size
+        self.colorkey = colorkey
+        self.key_bgr = tuple(colorkey[2::-1]) if colorkey is not None else None
+        self.key_tolerance = key_tolerance
+        self.key_softness = key_softness
+        self.key_mode = key_mode
+        self.loop = loop
+        self.frames = queue.Queue(maxsize=buffer_size)
+        self.stopped = threading.Event()
+        self.finished = threading.Event()   # reached the end of a non-looping video
+
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.seek_target = None
+
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            print(f"[ERROR] Cannot open video: {video_path}")
+            self.finished.set()
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_count = self.cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        self.duration = frame_count / self.fps if frame_count > 0 else 0.0
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def seek(self, t):
+        """Restart decoding at timeline time t. Returns the new generation."""
+        with self.lock:
+            self.generation += 1
+            self.seek_target = t
+            self.finished.clear()
+            return self.generation
+
+    def _make_frame(self, frame):
+        if (frame.shape[1], frame.shape[0]) != tuple(self.size):
+            frame = cv2.resize(frame, self.size)   # proxies are already at the target size
+        if self.colorkey is None:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            return pygame.image.frombuffer(frame, self.size, "RGB")  # shares the array
+        alpha = key_alpha(frame, self.key_bgr, self.key_tolerance, self.key_softness, self.key_mode)
+        return pygame.image.frombuffer(premultiplied_rgba(frame, alpha), self.size, "RGBA")
+
+    def _put(self, item):
+        # Block while the ring is full, but wake up regularly to notice stop() and seek()
+        while not self.stopped.is_set() and self.seek_target is None:
+            try:
+                self.frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _position(self):
+        """pts (seconds) of the last decoded frame."""
+        return self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+    def _seek(self, target):
+        """
+        Position the capture so the next grab() returns the frame showing target.
+        Returns the loop offset to add to media pts.
+        """
+        if self.loop and self.duration > 0:
+            loops, media_time = divmod(target, self.duration)
+        else:
+            loops, media_time = 0, target
+
+        pos = self._position()
+        if pos <= media_time < pos + self.SKIP_AHEAD:
+            # Close ahead: decode through without converting, cheaper than a seek
+            frame_time = 1.0 / self.fps
+            while self._position() + frame_time < media_time - 1e-6:
+                if not self.cap.grab():
+                    break
+        else:
+            # Far or backwards: the backend seeks to the preceding keyframe and decodes forward
+            self.cap.set(cv2.CAP_PROP_POS_MSEC, media_time * 1000.0)
+        return loops * self.duration
+
+    def _run(self):
+        loop_offset = 0.0
+        decoded_any = False
+        while not self.stopped.is_set() and self.cap.isOpened():
+            with self.lock:
+                target, self.seek_target = self.seek_target, None
+                generation = self.generation
+            if target is not None:
+                loop_offset = self._seek(target)
+
+            if self.finished.is_set():
+                self.stopped.wait(0.05)   # idle until a seek or stop
+                continue
+
+            if not self.cap.grab():
+                if not self.loop or not decoded_any:
+                    self.finished.set()
+                    continue
+                loop_offset += self.duration or (self._position() + 1.0 / self.fps)
+                self.cap.set(cv2.CAP_PROP_POS_MSEC, 0)
+                continue
+
+            pts = loop_offset + self._position()
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                continue
+            decoded_any = True
+            self._put((generation, pts, self._make_frame(frame)))
+        self.cap.release()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=1.0)
+
+
 class VideoPlayer:
-    def __init__(self, screen, video_path, start_time=0, end_time=None, scale=0.5, colorkey=(0,0,0)):
+    """
+    Centered, colorkeyed video overlay whose frames follow the timeline:
+    the frame shown is the one whose pts matches current_time - start_time at
+    the source's real frame rate, repeating or dropping frames as needed.
+
+    realtime=False (offline renders) waits for the decoder instead of showing
+    a stale frame, so every rendered frame is deterministic.
+    """
+    SEEK_THRESHOLD = 1.0   # seconds behind the timeline before seeking instead of catching up
+    REWIND_TOLERANCE = 0.1  # seconds the timeline may move backwards before seeking
+
+    def __init__(self, screen, video_path, start_time=0, end_time=None, scale=0.5, colorkey=(0,0,0),
+                 loop=True, realtime=True, key_tolerance=0, key_softness=0, key_mode="rgb"):
         self.screen = screen
         self.video_path = video_path
-        self.cap = cv2.VideoCapture(video_path)
         self.scale = scale
-        self.colorkey = colorkey
+        self.colorkey = tuple(colorkey) if colorkey is not None else None
         self.start_time = start_time
         self.end_time = end_time if end_time is not None else float('inf')
+        self.realtime = realtime
         self.screen_width, self.screen_height = screen.get_size()
         self.target_width = int(self.screen_width * scale)
         self.target_height = int(self.screen_height * scale)
 
+        # Decoding, conversion and scaling happen off the render thread
+        self.decoder = VideoDecoder(video_path, (self.target_width, self.target_height),
+                                    colorkey=self.colorkey, loop=loop, key_tolerance=key_tolerance,
+                                    key_softness=key_softness, key_mode=key_mode)
+        # Keyed frames arrive as premultiplied RGBA: one blending blit, no per-frame keying
+        self.blit_flags = pygame.BLEND_PREMULTIPLIED if self.colorkey is not None else 0
+        self.generation = 0
+        self.seeking = False     # a seek is in flight until its first frame arrives
+        self.current = None      # (generation, pts, surface) on screen
+        self.next_frame = None   # dequeued frame whose pts is still in the future
+
+    def _dequeue(self):
+        """Next frame of the current generation, or None if none is ready."""
+        while True:
+            try:
+                if self.realtime:
+                    item = self.decoder.frames.get_nowait()
+                else:
+                    item = self.decoder.frames.get(timeout=0.05)
+            except queue.Empty:
+                if self.realtime or self.decoder.finished.is_set() or self.decoder.stopped.is_set():
+                    return None
+                continue
+            if item[0] == self.generation:
+                self.seeking = False
+                return item
+
+    def _frame_for(self, elapsed):
+        """Latest decoded frame with pts <= elapsed; older frames are dropped."""
+        while True:
+            if self.next_frame is None:
+                self.next_frame = self._dequeue()
+                if self.next_frame is None:
+                    break
+            if self.next_frame[1] > elapsed:
+                break
+            self.current = self.next_frame
+            self.next_frame = None
+        return self.current
+
+    def seek(self, elapsed):
+        """Jump the video to elapsed seconds after start_time."""
+        self.generation = self.decoder.seek(elapsed)
+        self.seeking = True
+        self.current = None
+        self.next_frame = None
+        while True:
+            try:
+                self.decoder.frames.get_nowait()
+            except queue.Empty:
+                break
+
+    def scrub(self, current_time, timeout=0.15):
+        """
+        Seek to current_time and wait up to timeout seconds for the first frame there,
+        so an interactive jump shows the right frame immediately (preview mode).
+        """
+        if not (self.start_time <= current_time <= self.end_time):
+            return
+        self.seek(current_time - self.start_time)
+        deadline = time.perf_counter() + timeout
+        while self.current is None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.decoder.frames.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item[0] == self.generation:
+                self.seeking = False
+                self.current = item   # nearest frame to the target, even if its pts is just after
+
     def update(self, current_time):
         if not (self.start_time <= current_time <= self.end_time):
             return  # not time yet
 
-        ret, frame = self.cap.read()
-        if not ret:
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # loop if needed
-            return
+        elapsed = current_time - self.start_time
 
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame = cv2.resize(frame, (self.target_width, self.target_height))
-        frame_surface = pygame.Surface((self.target_width, self.target_height), pygame.SRCALPHA)
-        frame_surface.blit(pygame.surfarray.make_surface(frame.swapaxes(0,1)), (0,0))
-        frame_surface.set_colorkey(self.colorkey)
+        # Timeline moved backwards (scrub/loop): restart decoding from there
+        if self.current is not None and elapsed < self.current[1] - self.REWIND_TOLERANCE:
+            self.seek(elapsed)
+
+        frame = self._frame_for(elapsed)
+
+        # Timeline jumped far ahead of the decoder: seek rather than decode every frame in between
+        behind = frame is None and elapsed > self.SEEK_THRESHOLD
+        behind = behind or (frame is not None and frame[1] < elapsed - self.SEEK_THRESHOLD)
+        if behind and not self.seeking and not self.decoder.finished.is_set():
+            self.seek(elapsed)
+            frame = self._frame_for(elapsed)
+
+        if frame is None:
+            return
 
         x = (self.screen_width - self.target_width) // 2
         y = (self.screen_height - self.target_height) // 2
-        self.screen.blit(frame_surface, (x, y))
+        self.screen.blit(frame[2], (x, y), special_flags=self.blit_flags)
+
+    def close(self):
+        """Stop the decoder thread."""
+        self.decoder.stop()
 
 
 def play_centered_video(screen, video_path, scale=0.5, colorkey=(0, 0, 0)):
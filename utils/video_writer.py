@@ -0,0 +1,247 @@
+# utils/video_writer.py
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import pygame
+
+# ----------------------------
+# Pixel format helpers
+# ----------------------------
+def surface_pix_fmt(surface):
+    """
+    Return the ffmpeg rawvideo pix_fmt matching the surface's in-memory layout,
+    or None if the surface has to be converted to RGB first (not 32-bit, or rows padded).
+    """
+    if surface.get_bytesize() != 4 or surface.get_pitch() != surface.get_width() * 4:
+        return None
+    r, g, b, a = surface.get_masks()
+    little = {0x00FF0000: "bgr", 0x000000FF: "rgb"}
+    order = little.get(r)
+    if order is None or g != 0x0000FF00:
+        return None
+    return order + ("a" if a else "0")
+
+
+def surface_frame_bytes(surface):
+    """
+    Return the raw pixel data of a surface in the layout given by surface_pix_fmt.
+    32-bit surfaces without row padding are returned as a zero-copy buffer view.
+    """
+    if surface_pix_fmt(surface):
+        return surface.get_view("0")
+    return pygame.image.tobytes(surface, "RGB")
+
+
+# ----------------------------
+# ffmpeg encoder (raw frames over stdin)
+# ----------------------------
+class FFmpegWriter:
+    """
+    Streams raw pygame frames into an ffmpeg process.
+
+    Example usage:
+        writer = FFmpegWriter("out.mp4", screen.get_size(), fps=60, audio_path="voiceover.mp3")
+        writer.write(screen)   # once per frame
+        writer.close()
+    """
+    def __init__(self, output_path, size, fps=60, pix_fmt="rgb24", audio_path=None,
+                 codec="libx264", preset="veryfast", crf=18, keyint=None, ffmpeg_bin="ffmpeg"):
+        self.output_path = output_path
+        self.size = size
+        self.fps = fps
+        self.pix_fmt = pix_fmt
+        self.frames_written = 0
+
+        out_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(out_dir, exist_ok=True)
+
+        command = [
+            ffmpeg_bin, "-y", "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", pix_fmt,
+            "-s", f"{size[0]}x{size[1]}",
+            "-r", str(fps),
+            "-i", "-",
+        ]
+        if audio_path and os.path.exists(audio_path):
+            command += ["-i", audio_path, "-map", "0:v", "-map", "1:a", "-c:a", "aac", "-shortest"]
+        elif audio_path:
+            print(f"[WARN] Audio file not found, rendering without audio: {audio_path}")
+        command += [
+            "-c:v", codec,
+            "-preset", preset,
+            "-crf", str(crf),
+            "-pix_fmt", "yuv420p",
+        ]
+        if keyint:
+            # Fixed GOP so independently encoded chunks line up with a serial encode
+            command += ["-g", str(keyint), "-keyint_min", str(keyint), "-sc_threshold", "0"]
+        command.append(output_path)
+        self.proc = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    @classmethod
+    def for_surface(cls, output_path, surface, **kwargs):
+        """Create a writer whose input pix_fmt matches the surface (no RGB conversion per frame)."""
+        pix_fmt = surface_pix_fmt(surface) or "rgb24"
+        return cls(output_path, surface.get_size(), pix_fmt=pix_fmt, **kwargs)
+
+    def write(self, frame):
+        """Write one frame: a pygame.Surface or a bytes-like buffer in self.pix_fmt."""
+        if isinstance(frame, pygame.Surface):
+            if self.pix_fmt == "rgb24":
+                frame = pygame.image.tobytes(frame, "RGB")
+            else:
+                frame = surface_frame_bytes(frame)
+        self.proc.stdin.write(frame)
+        self.frames_written += 1
+
+    def close(self):
+        """Flush stdin and wait for ffmpeg to finish the file."""
+        if self.proc.stdin and not self.proc.stdin.closed:
+            self.proc.stdin.close()
+        ret = self.proc.wait()
+        if ret != 0:
+            print(f"[ERROR] ffmpeg exited with code {ret} for {self.output_path}")
+        return ret
+
+
+def concat_videos(segment_paths, output_path, audio_path=None, ffmpeg_bin="ffmpeg"):
+    """
+    Join segments encoded with identical settings into output_path without re-encoding
+    (ffmpeg concat demuxer, stream copy), muxing audio_path in the same pass.
+    Returns ffmpeg's exit code.
+    """
+    list_path = output_path + ".concat.txt"
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in segment_paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    command = [ffmpeg_bin, "-y", "-loglevel", "error",
+               "-f", "concat", "-safe", "0", "-i", list_path]
+    if audio_path and os.path.exists(audio_path):
+        command += ["-i", audio_path, "-map", "0:v", "-map", "1:a",
+                    "-c:v", "copy", "-c:a", "aac", "-shortest"]
+    else:
+        if audio_path:
+            print(f"[WARN] Audio file not found, rendering without audio: {audio_path}")
+        command += ["-c", "copy"]
+    command.append(output_path)
+
+    try:
+        ret = subprocess.run(command).returncode
+    finally:
+        os.remove(list_path)
+    if ret != 0:
+        print(f"[ERROR] ffmpeg concat exited with code {ret} for {output_path}")
+    return ret
+
+
+# ----------------------------
+# Live session recorder (record_video)
+# ----------------------------
+class AsyncFrameRecorder:
+    """
+    Records a live pygame session without stalling the render loop.
+
+    capture() copies the display surface once through its raw buffer view into a
+    pooled buffer and queues it; a background thread feeds ffmpeg. When the pool is
+    exhausted the frame is dropped rather than blocking, and the encoder repeats the
+    previous frame so the video stays on the timeline. close() muxes in the voiceover.
+
+    Example usage:
+        recorder = AsyncFrameRecorder("session.mp4", screen, fps=60)
+        pygame.display.flip()
+        recorder.capture(screen, current_time)   # once per frame
+        recorder.close(audio_path="voiceover.mp3")
+    """
+    def __init__(self, output_path, surface, fps=60, queue_size=8, ffmpeg_bin="ffmpeg"):
+        self.output_path = output_path
+        self.fps = fps
+        self.ffmpeg_bin = ffmpeg_bin
+        self.frames_dropped = 0
+
+        base, ext = os.path.splitext(output_path)
+        self.video_only_path = f"{base}.video{ext or '.mp4'}"
+        self.writer = FFmpegWriter.for_surface(self.video_only_path, surface, fps=fps,
+                                               ffmpeg_bin=ffmpeg_bin)
+
+        # Bounded pool: at most queue_size frames are ever in flight
+        w, h = surface.get_size()
+        frame_bytes = w * h * 3 if self.writer.pix_fmt == "rgb24" else surface.get_pitch() * h
+        self.free = queue.Queue()
+        for _ in range(queue_size):
+            self.free.put(bytearray(frame_bytes))
+        self.pending = queue.Queue(maxsize=queue_size)
+
+        self.thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.thread.start()
+
+    def capture(self, surface, current_time):
+        """Queue the current contents of surface as the frame at current_time (never blocks)."""
+        try:
+            buf = self.free.get_nowait()
+        except queue.Empty:
+            self.frames_dropped += 1
+            return False
+
+        if self.writer.pix_fmt == "rgb24":
+            buf[:] = pygame.image.tobytes(surface, "RGB")
+        else:
+            view = surface.get_view("0")
+            buf[:] = memoryview(view)
+            del view  # unlock the surface before the next draw
+        self.pending.put((current_time, buf))
+        return True
+
+    def _encode_loop(self):
+        last = None
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            current_time, buf = item
+            # Repeat the previous frame over any gap left by dropped frames
+            target = int(round(current_time * self.fps))
+            if last is not None:
+                while self.writer.frames_written < target:
+                    self.writer.write(last)
+            if self.writer.frames_written <= target:
+                self.writer.write(buf)
+            if last is not None:
+                self.free.put(last)
+            last = buf
+        if last is not None:
+            self.free.put(last)
+
+    def close(self, audio_path=None):
+        """Stop the encoder thread, finish the file and mux audio_path into it."""
+        self.pending.put(None)
+        self.thread.join()
+        if self.writer.close() != 0:
+            return None
+
+        if self.frames_dropped:
+            print(f"[WARN] Recorder dropped {self.frames_dropped} frames (encoder behind)")
+
+        if audio_path and os.path.exists(audio_path):
+            command = [
+                self.ffmpeg_bin, "-y", "-loglevel", "error",
+                "-i", self.video_only_path,
+                "-i", audio_path,
+                "-map", "0:v", "-map", "1:a",
+                "-c:v", "copy", "-c:a", "aac", "-shortest",
+                self.output_path
+            ]
+            try:
+                subprocess.run(command, check=True)
+                os.remove(self.video_only_path)
+            except (subprocess.CalledProcessError, OSError) as e:
+                print(f"[ERROR] Could not mux audio into recording: {e}")
+                return self.video_only_path
+        else:
+            shutil.move(self.video_only_path, self.output_path)
+        print(f"[INFO] Recording saved to {self.output_path}")
+        return self.output_path
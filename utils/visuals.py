@@ -86,35 +86,6 @@ def play_voiceover(voiceover_path):
         return False
 
 
-# ----------------------------
-# Helper generator for words or sentences
-# ----------------------------
-def text_by_second(timestamps, start_time=None):
-    if start_time is None:
-        start_time = time.time()
-    idx = 0
-    text_to_show = ""
-    while idx < len(timestamps):
-        elapsed = time.time() - start_time
-        while idx < len(timestamps) and float(timestamps[idx]["time"]) <= elapsed:
-            text_to_show = timestamps[idx]["text"]
-            idx += 1
-        yield text_to_show
-    while True:
-        yield text_to_show
-
-
-# ----------------------------
-# Timestamp overlay helper (0.000 format)
-# ----------------------------
-def render_timestamps(screen, font, start_time, end_time):
-    run_seconds = time.time() - start_time
-    elapsed_text = font.render(f"Elapsed: {run_seconds:06.3f}s", True, (255, 255, 255))
-    screen.blit(elapsed_text, (10, 10))
-    end_text = font.render(f"End: {end_time:06.3f}s", True, (255, 255, 255))
-    screen.blit(end_text, (screen.get_width() - end_text.get_width() - 10, 10))
-
-
 # ----------------------------
 # Main visuals
 # ----------------------------
@@ -184,26 +155,17 @@ def play_voiceover(voiceover_path):
         print(f"[ERROR] Could not play voiceover: {e}")
         return False
 
-def text_by_second(timestamps, start_time=None):
-    if start_time is None:
-        start_time = time.time()
-    idx = 0
-    text_to_show = ""
-    while idx < len(timestamps):
+def render_timestamps(screen, font, start_time, end_time, elapsed=None):
+    """Draw the elapsed / end counters. Returns the rects drawn."""
+    if elapsed is None:
         elapsed = time.time() - start_time
-        while idx < len(timestamps) and float(timestamps[idx]["time"]) <= elapsed:
-            text_to_show = timestamps[idx]["text"]
-            idx += 1
-        yield text_to_show
-    while True:
-        yield text_to_show
-
-def render_timestamps(screen, font, start_time, end_time):
-    elapsed = time.time() - start_time
-    elapsed_text = font.render(f"Elapsed: {elapsed:06.3f}s", True, (255, 255, 255))
-    screen.blit(elapsed_text, (10, 10))
-    end_text = font.render(f"End: {end_time:06.3f}s", True, (255, 255, 255))
-    screen.blit(end_text, (screen.get_width() - end_text.get_width() - 10, 10))
+    # Static labels come from the text cache; the changing digits from the glyph atlas
+    label = text_cache.render(font, "Elapsed: ", (255, 255, 255))
+    label_rect = screen.blit(label, (10, 10))
+    digits_rect = get_glyph_atlas(font, (255, 255, 255)).blit(screen, f"{elapsed:06.3f}s", (10 + label.get_width(), 10))
+    end_text = text_cache.render(font, f"End: {end_time:06.3f}s", (255, 255, 255))
+    end_rect = screen.blit(end_text, (screen.get_width() - end_text.get_width() - 10, 10))
+    return [label_rect.union(digits_rect), end_rect]
 
 # ----------------------------
 # Video helpers
@@ -239,16 +201,51 @@ import json
 import pygame
 import cv2
 import numpy as np
-from utils.backgrounds import play_circular_pulsing_net, draw_psychedelic_background
+from utils.backgrounds import CircularPulsingNet, draw_psychedelic_background
 from utils.utils_wavy_checker import run_wavy_checker
-from utils.transitions import spin_fade, swirl_effect
+from utils.transitions import SpinFade, SwirlEffect
 from utils.full_image import render_full_image
 from utils.two_side_images import TwoSideImagesAnimator
 from utils.tv_countdown import TVCountdownWithBurst
 from utils.arrow_overlay import ArrowOverlay
+from utils.particles import EmberOverlay
+from utils.glitch import GlitchOverlay
 from utils.video_utils import VideoPlayer
+from utils.video_writer import FFmpegWriter, AsyncFrameRecorder
+from utils.timeline import Timeline
+from utils.schedule_compiler import load_compiled_schedule
+from utils.asset_cache import cache_stats
+from utils.text_cache import text_cache, get_glyph_atlas
+from utils.captions import CaptionTrack
+from utils.media_clock import MediaClock, music_position
+from utils.preview import ScrubBar, key_target
+from utils.proxy_media import get_proxy, video_target_size, PROXY_KEY_TOLERANCE
+from utils.compositor import DirtyRectCompositor, STATIC_EVENTS, static_layer_key
+from utils.profiler import FrameProfiler, LAYER_NAMES
+
+def schedule_end_time(event_schedule, timestamps):
+    """Last event or transcript time: run_visuals stops on the first frame past it."""
+    return max(
+        [float(e.get("time", 0)) for e in event_schedule if "time" in e] +
+        [float(t.get("time", 0)) for t in timestamps],
+        default=0.0
+    )
+
+
+def run_visuals(timestamps, event_schedule, font_name, font_size, settings, data=None, screen=None,
+                output_path=None, fps=60, start_frame=0, end_frame=None, audio=True, keyint=None):
+    """
+    Play the event schedule in a window, or render it offline.
+
+    output_path: when set, time advances by a fixed 1/fps step per frame instead of
+                 the wall clock, nothing waits on clock.tick, and every frame is piped
+                 into ffmpeg (voiceover muxed in) so the render runs as fast as the CPU allows.
+    start_frame, end_frame: offline only, render frames [start_frame, end_frame) of the
+                 timeline (one chunk of a parallel render). audio=False skips the voiceover mux,
+                 keyint fixes the encoder GOP length (frames).
+    """
+    offline = output_path is not None
 
-def run_visuals(timestamps, event_schedule, font_name, font_size, settings, data=None, screen=None):
     # ----------------------------
     # Create main window 1600x600
     # ----------------------------
@@ -264,25 +261,53 @@ def run_visuals(timestamps, event_schedule, font_name, font_size, settings, data
     # ----------------------------
     # Load event schedule
     # ----------------------------
+    # Validated, path-resolved timeline, cached until the schedule or an asset changes
     if os.path.exists(events_file):
-        with open(events_file, "r", encoding="utf-8-sig") as f:
-            file_data = json.load(f)
-        event_schedule[:] = file_data.get("events", [])
+        event_schedule[:], timeline = load_compiled_schedule(events_file, cache_dir=settings.get("cache_dir"))
     else:
         event_schedule[:] = []
-
-    end_time = max(
-        [float(e.get("time", 0)) for e in event_schedule if "time" in e] +
-        [float(t.get("time", 0)) for t in timestamps],
-        default=0.0
-    )
+        timeline = Timeline(event_schedule)
+
+    end_time = schedule_end_time(event_schedule, timestamps)
+
+    # Preview mode (settings["preview"]): scrub and seek with keys and mouse, see utils/preview.py
+    preview = bool(settings.get("preview")) and not offline
+
+    # Preview sessions play pre-scaled proxies of the videos (settings["use_proxies"], default on);
+    # offline renders and recorded sessions always decode the originals. A first run transcodes
+    # them: do it before the voiceover and the media clock start, or the visuals open already behind
+    use_proxies = preview and settings.get("use_proxies", True) and not settings.get("record_video")
+    left_sub = screen.subsurface((0, 0, 800, 600))
+    proxy_files = {}
+    if use_proxies:
+        for ev in timeline:
+            if ev.type == "centered_video":
+                video_file = ev.params["video_path"]
+                proxy_files[ev.index] = get_proxy(video_file, video_target_size(ev.params, left_sub.get_size()),
+                                                  cache_dir=settings.get("cache_dir"),
+                                                  source_sha1=timeline.assets.get(video_file, {}).get("sha1"))
 
     # ----------------------------
     # Play voiceover
     # ----------------------------
     voiceover_path = settings.get("voiceover_path")
-    if voiceover_path and os.path.exists(voiceover_path):
-        play_voiceover(voiceover_path)
+    writer = None
+    voiceover_playing = False
+    if offline:
+        writer = FFmpegWriter.for_surface(output_path, screen, fps=fps,
+                                          audio_path=voiceover_path if audio else None,
+                                          keyint=keyint)
+        print(f"[INFO] Offline render: {end_time:.3f}s at {fps} fps -> {output_path}")
+    elif voiceover_path and os.path.exists(voiceover_path):
+        voiceover_playing = play_voiceover(voiceover_path)
+
+    # Live session recording (settings["record_video"])
+    recorder = None
+    if not offline and settings.get("record_video"):
+        record_dir = settings.get("record_dir") or os.path.join(base_dir, "..", "recordings")
+        record_path = os.path.join(record_dir, time.strftime("%Y-%m-%d%H-%M-%S") + ".mp4")
+        recorder = AsyncFrameRecorder(record_path, screen, fps=fps)
+        print(f"[INFO] Recording session to {record_path}")
 
     clock = pygame.time.Clock()
 
@@ -311,100 +336,183 @@ def run_visuals(timestamps, event_schedule, font_name, font_size, settings, data
     except:
         font = pygame.font.SysFont(None, font_size)
 
-    start_time_global = time.time()
-    text_gen = text_by_second(timestamps, start_time=start_time_global)
+    # Offline renders step a frame counter; live sessions follow the voiceover's
+    # playback position (a plain monotonic clock when there is no voiceover)
+    frame_index = start_frame
+    start_time_global = 0.0   # every clock reports timeline time directly
+    if offline:
+        frame_clock = lambda: frame_index / fps
+    else:
+        media_clock = MediaClock(music_position if voiceover_playing else None)
+        frame_clock = media_clock.time
+    captions = CaptionTrack(timestamps)
+    caption_surface = None
     two_side_animators = {}
+    pulsing_net = CircularPulsingNet()   # keeps its radial mask between frames
 
-    # Background events
-    background_events = [e for e in event_schedule if e.get("event") in ("circular_pulsing_net", "psychedelic_background", "run_wavy_checker")]
-
-    # Medium-priority events
+    # Stateful per-frame events (transitions and overlays, keyed by schedule index)
     medium_priority_events = {}
-    for event in event_schedule:
-        ev_type = event.get("event")
-        key = id(event)
-        params = event.get("params", {})
-        left_sub = screen.subsurface((0, 0, 800, 600))
-
-        if ev_type == "tv_countdown":
-            medium_priority_events[key] = TVCountdownWithBurst(left_sub, start_time=float(event.get("start_time", 0)))
-        elif ev_type == "arrow_overlay":
-            medium_priority_events[key] = ArrowOverlay(left_sub, params)
-        elif ev_type == "centered_video":
-            medium_priority_events[key] = VideoPlayer(left_sub,
-                                                      video_path=params["video_path"],
-                                                      start_time=params.get("start_time", 0),
-                                                      end_time=params.get("end_time", float('inf')),
-                                                      scale=params.get("scale", 0.5),
-                                                      colorkey=params.get("colorkey", (0,0,0)))
+    window_sub = screen.subsurface(screen.get_rect())
+    for ev in timeline:
+        params = ev.params
+        if ev.type == "spin_fade":
+            medium_priority_events[ev.index] = SpinFade(window_sub, start_time=ev.start, duration=ev.duration)
+        elif ev.type == "swirl_effect":
+            medium_priority_events[ev.index] = SwirlEffect(window_sub, start_time=ev.start, duration=ev.duration,
+                                                           swirl_strength=params.get("swirl_strength", 5),
+                                                           quality=params.get("quality"))
+        elif ev.type == "tv_countdown":
+            medium_priority_events[ev.index] = TVCountdownWithBurst(left_sub, start_time=ev.start)
+        elif ev.type == "embers":
+            medium_priority_events[ev.index] = EmberOverlay(left_sub, start_time=ev.start,
+                                                            count=int(params.get("count", 250)),
+                                                            seed=int(params.get("seed", ev.index)),
+                                                            high_start_chance=params.get("high_start_chance", 0.15))
+        elif ev.type == "glitch":
+            medium_priority_events[ev.index] = GlitchOverlay(left_sub, start_time=ev.start,
+                                                             intensity=float(params.get("intensity", 0.1)),
+                                                             seed=int(params.get("seed", ev.index)))
+        elif ev.type == "arrow_overlay":
+            medium_priority_events[ev.index] = ArrowOverlay(left_sub, params)
+        elif ev.type == "centered_video":
+            video_file = proxy_files.get(ev.index, params["video_path"])
+            key_tolerance = params.get("key_tolerance", 0)
+            if video_file != params["video_path"]:
+                # JPEG-coded proxies are never exactly the key color
+                key_tolerance = max(key_tolerance, PROXY_KEY_TOLERANCE)
+            medium_priority_events[ev.index] = VideoPlayer(left_sub,
+                                                           video_path=video_file,
+                                                           start_time=ev.start,
+                                                           end_time=ev.end,
+                                                           scale=params.get("scale", 0.5),
+                                                           colorkey=params.get("colorkey", (0,0,0)),
+                                                           loop=params.get("loop", True),
+                                                           realtime=not offline,
+                                                           key_tolerance=key_tolerance,
+                                                           key_softness=params.get("key_softness", 0),
+                                                           key_mode=params.get("key_mode", "rgb"))
+
+    # Static segments (only full images, arrows, held two-side images on screen)
+    # reuse the cached layer composite and only redraw the text overlays
+    compositor = DirtyRectCompositor(screen)
+
+    def is_static(ev):
+        if ev.type in STATIC_EVENTS:
+            return True
+        if ev.type == "two_side_images":
+            animator = two_side_animators.get(ev.index)
+            # Without slide-in it only holds still once its segment has started drawing
+            return animator is not None and (animator.done or
+                                             (not animator.slide_in and current_time >= animator.start))
+        if ev.type == "tv_countdown":
+            return medium_priority_events[ev.index].done
+        return False
+
+    # Frame-time profiling: settings["profile"], ["profile_hud"] and ["profile_trace"] (trace file path)
+    trace_path = settings.get("profile_trace")
+    profiler = FrameProfiler(enabled=bool(settings.get("profile") or settings.get("profile_hud") or trace_path),
+                             trace=bool(trace_path), hud_visible=bool(settings.get("profile_hud")))
+
+    scrub_bar = ScrubBar(screen.get_rect(), end_time, [ev.start for ev in timeline]) if preview else None
+    paused = False          # space bar
+    scrubbing = False       # mouse held on the scrub bar
+    hold_time = 0.0         # timeline time shown while paused or scrubbing
+    seek_started = None     # perf_counter of the last seek, until its frame is on screen
+    seek_warned = False
+
+    def seek_to(t):
+        """Jump to timeline time t, rebuilding only the state that depends on time."""
+        nonlocal hold_time, seek_started, seek_warned, caption_surface
+        seek_started = time.perf_counter()
+        text = captions.seek(t)   # the next update() clears captions.changed: render the caption now
+        caption_surface = text_cache.render(font, text, (255,255,255)) if text else None
+        for ev in timeline:
+            if ev.end <= t:
+                continue   # finished before t: never drawn again, state irrelevant
+            state = medium_priority_events.get(ev.index) or two_side_animators.get(ev.index)
+            if state is None:
+                continue
+            if hasattr(state, "done"):
+                state.done = False   # transitions/countdowns/animators may run again
+            if ev.start <= t and hasattr(state, "scrub"):
+                state.scrub(t)       # e.g. video: decode the target frame now
+        compositor.invalidate()
+
+        hold_time = t
+        if paused or scrubbing:
+            if voiceover_playing:
+                pygame.mixer.music.pause()
+            return
+        if voiceover_playing:
+            try:
+                pygame.mixer.music.play(start=t)
+            except pygame.error as e:
+                if not seek_warned:
+                    print(f"[WARN] Voiceover cannot seek ({e}); restarting it from the beginning")
+                    seek_warned = True
+                pygame.mixer.music.play()
+        media_clock.start(t)
 
     # ----------------------------
     # Main loop
     # ----------------------------
     running = True
+    left_surface = screen.subsurface(screen.get_rect())  # fills the entire window
     while running:
-        current_time = time.time() - start_time_global
+        if preview and (paused or scrubbing):
+            current_time = hold_time
+        else:
+            current_time = frame_clock() - start_time_global
+        profiler.begin_frame(current_time)
+        active_events = timeline.active(current_time)
+        redraw = compositor.begin_frame(static_layer_key(active_events, is_static))
 
         # Clear left and right halves
-        screen.fill((30,30,30), rect=pygame.Rect(0,0,800,600))    # left visuals
-        screen.fill((0,0,0), rect=pygame.Rect(800,0,800,600))     # right video
-        #left_surface = screen.subsurface((0,0,800,600))
-        left_surface = screen.subsurface(screen.get_rect())  # fills the entire window
+        if redraw:
+            screen.fill((30,30,30), rect=pygame.Rect(0,0,800,600))    # left visuals
+            screen.fill((0,0,0), rect=pygame.Rect(800,0,800,600))     # right video
 
         # ----------------------------
-        # LEFT: Backgrounds
+        # LEFT: Active events (backgrounds, middle-priority, medium-priority overlays)
         # ----------------------------
-        for bg_event in background_events:
-            start = float(bg_event.get("start_time", 0))
-            duration = float(bg_event.get("params", {}).get("duration", 9999))
-            if start <= current_time <= start + duration:
-                if bg_event.get("event") == "circular_pulsing_net":
-                    play_circular_pulsing_net(left_surface, t=current_time)
-                elif bg_event.get("event") == "psychedelic_background":
+        for ev in (active_events if redraw else ()):
+            params = ev.params
+            with profiler.measure(ev.type, LAYER_NAMES[ev.layer], ev.index):
+                if ev.type == "circular_pulsing_net":
+                    pulsing_net.draw(left_surface, t=current_time)
+                elif ev.type == "psychedelic_background":
                     draw_psychedelic_background(left_surface, t=current_time)
-                elif bg_event.get("event") == "run_wavy_checker":
-                    run_wavy_checker(left_surface, t=current_time, start=start, duration=duration)
-
-        # ----------------------------
-        # LEFT: Middle-priority events
-        # ----------------------------
-        for event in event_schedule:
-            ev_type = event.get("event")
-            params = event.get("params", {})
-            event_start = float(event.get("start_time", event.get("time", 0)))
-            event_end = event_start + float(params.get("duration", 5))
-            if not (event_start <= current_time <= event_end):
-                continue
-            if ev_type == "spin_fade":
-                spin_fade(left_surface.copy(), left_surface, int(params.get("duration", 2)*1000))
-            elif ev_type == "swirl_effect":
-                swirl_effect(left_surface.copy(), left_surface, int(params.get("duration", 2)*1000),
-                             params.get("swirl_strength", 5))
-            elif ev_type == "two_side_images":
-                key = id(event)
-                if key not in two_side_animators:
-                    animator = TwoSideImagesAnimator(left_surface,
-                                                     segment=params["segment"],
-                                                     screen_width=800, screen_height=600)
-                    two_side_animators[key] = animator
-                two_side_animators[key].update(current_time)
-            elif ev_type == "full_image":
-                render_full_image(left_surface, params, current_time)
-
-        # ----------------------------
-        # LEFT: Medium-priority updates
-        # ----------------------------
-        for mp_event in medium_priority_events.values():
-            mp_event.update(current_time)
+                elif ev.type == "run_wavy_checker":
+                    run_wavy_checker(left_surface, t=current_time, start=ev.start, duration=ev.duration)
+                elif ev.type == "two_side_images":
+                    if ev.index not in two_side_animators:
+                        animator = TwoSideImagesAnimator(left_surface,
+                                                         segment=params["segment"],
+                                                         screen_width=800, screen_height=600)
+                        two_side_animators[ev.index] = animator
+                    two_side_animators[ev.index].update(current_time)
+                elif ev.type == "full_image":
+                    render_full_image(left_surface, params, current_time)
+                elif ev.index in medium_priority_events:
+                    medium_priority_events[ev.index].update(current_time)
+        if redraw:
+            compositor.cache_static()
 
         # ----------------------------
         # LEFT: Text overlay
         # ----------------------------
-        text_to_show = next(text_gen)
-        if text_to_show:
-            text_surface = font.render(text_to_show, True, (255,255,255))
-            left_surface.blit(text_surface, (50,50))
-        render_timestamps(left_surface, font, start_time_global, end_time)
+        with profiler.measure("text", "text"):
+            text_to_show = captions.update(current_time)
+            if captions.changed:
+                # Only look the caption up again when the track says it changed
+                caption_surface = text_cache.render(font, text_to_show, (255,255,255)) if text_to_show else None
+            if caption_surface:
+                compositor.add_overlay(left_surface.blit(caption_surface, (50,50)))
+            for rect in render_timestamps(left_surface, font, start_time_global, end_time, elapsed=current_time):
+                compositor.add_overlay(rect)
+        compositor.add_overlay(profiler.draw_hud(left_surface, font))
+        if scrub_bar:
+            compositor.add_overlay(scrub_bar.draw(screen, current_time))
 
         # ----------------------------
         # RIGHT: Video
@@ -423,19 +531,71 @@ def run_visuals(timestamps, event_schedule, font_name, font_size, settings, data
         # ----------------------------
         # Display
         # ----------------------------
-        pygame.display.flip()
-        clock.tick(60)
-
-        # Quit events
+        if offline:
+            with profiler.measure("encode", "present"):
+                writer.write(screen)
+            profiler.end_frame()
+            frame_index += 1
+        else:
+            with profiler.measure("present", "present"):
+                compositor.present()
+                if recorder:
+                    recorder.capture(screen, current_time)
+            profiler.end_frame()   # frame time excludes the wait in clock.tick
+            if seek_started is not None and not scrubbing:
+                print(f"[INFO] Seek to {current_time:.3f}s: {(time.perf_counter() - seek_started) * 1000:.0f} ms")
+            seek_started = None
+            clock.tick(fps)
+
+        # Quit events, F3 toggles the frame-time HUD
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
                 running = False
-                pygame.mixer.music.stop()
-
-        if current_time > end_time:
+                if not offline:
+                    pygame.mixer.music.stop()
+            elif e.type == pygame.KEYDOWN and e.key == pygame.K_F3:
+                profiler.enabled = True
+                profiler.toggle_hud()
+            elif not preview:
+                continue
+            elif e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
+                paused = not paused
+                seek_to(current_time)   # pauses, or restarts audio and clock where we stopped
+            elif e.type == pygame.KEYDOWN:
+                target = key_target(e.key, e.mod, current_time, timeline, end_time)
+                if target is not None:
+                    seek_to(target)
+            elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and scrub_bar.hit(e.pos):
+                scrubbing = True
+                seek_to(scrub_bar.time_at(e.pos[0]))
+            elif e.type == pygame.MOUSEMOTION and scrubbing:
+                seek_to(min(max(scrub_bar.time_at(e.pos[0]), 0.0), end_time))
+            elif e.type == pygame.MOUSEBUTTONUP and e.button == 1 and scrubbing:
+                scrubbing = False
+                seek_to(hold_time)      # resume playback from where the mouse let go
+
+        if preview:
+            if current_time > end_time and not paused:
+                paused = True           # hold the last frame instead of closing
+                seek_to(end_time)
+        elif current_time > end_time or (end_frame is not None and frame_index >= end_frame):
             running = False
-            pygame.mixer.music.stop()
+            if not offline:
+                pygame.mixer.music.stop()
 
-    # Release video capture
+    # Release video capture and decoder threads
     if cap:
         cap.release()
+    for mp_event in medium_priority_events.values():
+        if hasattr(mp_event, "close"):
+            mp_event.close()
+    if recorder:
+        recorder.close(audio_path=voiceover_path)
+    if writer:
+        writer.close()
+        print(f"[INFO] Rendered {writer.frames_written} frames to {output_path}")
+        print(f"[INFO] Asset cache: {cache_stats()}")
+    if profiler.enabled and profiler.frames:
+        print(f"[INFO] Frame times (ms): {profiler.summary()}")
+    if trace_path:
+        profiler.write_trace(trace_path)